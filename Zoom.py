@@ -1,154 +1,142 @@
 import cv2
-import mediapipe as mp
-import time
+import numpy as np
 
 from app_controller import zoom_in, zoom_out
-
-
-def run_zoom():
-    mp_hands = mp.solutions.hands
-    mp_drawing = mp.solutions.drawing_utils
-
-    cap = cv2.VideoCapture(0)
-
-    # Reset gesture counters
-    zoom_in_frames = 0
-    zoom_out_frames = 0
-    fist_frames = 0
+from frame_pipeline import HandPipeline, open_camera
+from gesture_kernels import (
+    ACTION_EXIT, ACTION_ZOOM_IN, ACTION_ZOOM_OUT, GESTURE_FIST, GESTURE_NONE,
+    GESTURE_ZOOM_IN, GESTURE_ZOOM_OUT, PIP_IDS, TIP_IDS, finger_code, landmarks_to_array,
+    new_zoom_counters, update_zoom_fsm,
+)
+from hand_detector_pool import get_hands, release
+from overlay import StaticOverlay, draw_hand, show_frame
+
+# Index finger needs a clearer margin above its PIP joint than the others
+PIP_MARGIN = np.array([0.02, 0.0, 0.0, 0.0], dtype=np.float32)
+
+GESTURE_TABLE = {
+    0b00000: GESTURE_FIST,
+    # Zoom gestures ignore the thumb, so both thumb states are listed
+    0b01000: GESTURE_ZOOM_IN,
+    0b11000: GESTURE_ZOOM_IN,
+    0b01100: GESTURE_ZOOM_OUT,
+    0b11100: GESTURE_ZOOM_OUT,
+}
+
+# Thumb + Index + Pinky up, others down
+EXIT_CODE = 0b11001
+
+
+def run_zoom(hands=None, cap=None):
+    # A camera passed in by the caller stays open for it after the mode exits
+    own_cap = cap is None
+    if own_cap:
+        cap = open_camera()
+
+    # Hold counters for [zoom_in, zoom_out, fist], updated by update_zoom_fsm
+    counters = new_zoom_counters()
 
     GESTURE_FRAMES_REQUIRED = 8  # Increased for more stability
     ZOOM_COOLDOWN = 0.5  # Increased cooldown to prevent rapid firing
     last_action_time = 0
 
     zoom_mode_active = True
-    current_gesture = None
-
-    def fingers_up(hand, h, w):
-        lm = hand.landmark
-        thumb_tip = lm[4]
-        thumb_ip = lm[3]
-        thumb_extended = thumb_tip.x < thumb_ip.x
-        fingers = [thumb_extended]
-        tip_ids = [8, 12, 16, 20]
-        pip_ids = [6, 10, 14, 18]
-        for tip_id, pip_id in zip(tip_ids, pip_ids):
-            tip = lm[tip_id]
-            pip = lm[pip_id]
-            if tip_id == 8:
-                fingers.append(tip.y < pip.y - 0.02)
+    current_gesture = GESTURE_NONE
+    hud = None
+
+    def draw_hud(img):
+        cv2.putText(img, "ZOOM MODE - ACTIVE", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+        cv2.putText(img, "Fist to EXIT", (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
+
+    def fingers_up(pts):
+        # [thumb, index, middle, ring, pinky] packed into a 5-bit code
+        fingers = np.empty(5, dtype=bool)
+        fingers[0] = pts[4, 0] < pts[3, 0]
+        fingers[1:] = pts[TIP_IDS, 1] < pts[PIP_IDS, 1] - PIP_MARGIN
+        return finger_code(fingers)
+
+    def detect_gesture(code):
+        return GESTURE_TABLE.get(code, GESTURE_NONE)
+
+    # Shared detector: stays loaded across mode switches instead of being
+    # rebuilt (and its models reloaded) every time zoom mode starts
+    if hands is None:
+        hands = get_hands(max_hands=1, det=0.7, track=0.7)
+    print("Starting Zoom Mode...")
+    print("Gestures: Index -> Zoom In; Index+Middle -> Zoom Out; Fist -> Exit")
+    exit_start = None
+    EXIT_HOLD = 2.0  # seconds required to return to master controller
+
+    # Capture and inference run on their own threads; this loop only
+    # consumes the newest (mirrored frame, result) pair.
+    pipeline = HandPipeline(cap, hands).start()
+    result = None
+
+    while zoom_mode_active:
+        item = pipeline.read()
+        if item is None:
+            break
+
+        # Capture-time monotonic stamp doubles as the clock for every
+        # cooldown/hold check this iteration
+        frame, new_result, current_time = item
+        h, w, _ = frame.shape
+        # Frames the pipeline did not infer arrive with result=None and
+        # reuse the last result (none yet: no hand)
+        if new_result is not None:
+            result = new_result
+
+        if result is not None and result.hand_landmarks:
+            hand = result.hand_landmarks[0]
+            draw_hand(frame, hand)
+
+            code = fingers_up(landmarks_to_array(hand))
+            gesture = detect_gesture(code)
+
+            # Check for master-exit gesture: Thumb + Index + Pinky up (others down)
+            if code == EXIT_CODE:
+                if exit_start is None:
+                    exit_start = current_time
+                elif current_time - exit_start >= EXIT_HOLD:
+                    print("Master-exit gesture held — returning to master controller...")
+                    break
             else:
-                fingers.append(tip.y < pip.y)
-        return fingers
-
-    def detect_gesture(fingers):
-        thumb, index, middle, ring, pinky = fingers
-        if index and not any([middle, ring, pinky]):
-            return "zoom_in"
-        elif index and middle and not any([ring, pinky]):
-            return "zoom_out"
-        elif not any([thumb, index, middle, ring, pinky]):
-            return "fist"
-        return None
-
-    with mp_hands.Hands(
-        max_num_hands=1,
-        min_detection_confidence=0.7,
-        min_tracking_confidence=0.7
-    ) as hands:
-        print("Starting Zoom Mode...")
-        print("Gestures: Index -> Zoom In; Index+Middle -> Zoom Out; Fist -> Exit")
-        exit_start = None
-        EXIT_HOLD = 2.0  # seconds required to return to master controller
-
-        while zoom_mode_active:
-            ret, frame = cap.read()
-            if not ret:
+                exit_start = None
+
+            # Hold-counter state machine runs as one compiled call
+            current_gesture, action = update_zoom_fsm(
+                gesture, current_gesture, counters, GESTURE_FRAMES_REQUIRED,
+                (current_time - last_action_time) >= ZOOM_COOLDOWN
+            )
+
+            if action == ACTION_ZOOM_IN:
+                zoom_in()
+                print(f"ZOOM IN - Gesture held for {counters[0]} frames")
+                last_action_time = current_time
+            elif action == ACTION_ZOOM_OUT:
+                zoom_out()
+                print(f"ZOOM OUT - Gesture held for {counters[1]} frames")
+                last_action_time = current_time
+            elif action == ACTION_EXIT:
+                print("Exiting Zoom Mode...")
                 break
 
-            frame = cv2.flip(frame, 1)
-            h, w, _ = frame.shape
-
-            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            result = hands.process(rgb)
-
-            current_time = time.time()
-
-            if result.multi_hand_landmarks:
-                hand = result.multi_hand_landmarks[0]
-                mp_drawing.draw_landmarks(frame, hand, mp_hands.HAND_CONNECTIONS)
-
-                fingers = fingers_up(hand, h, w)
-                gesture = detect_gesture(fingers)
-
-                # Check for master-exit gesture: Thumb + Index + Pinky up (others down)
-                # fingers = [thumb, index, middle, ring, pinky]
-                if fingers[0] and fingers[1] and (not fingers[2]) and (not fingers[3]) and fingers[4]:
-                    if exit_start is None:
-                        exit_start = current_time
-                    elif current_time - exit_start >= EXIT_HOLD:
-                        print("Master-exit gesture held — returning to master controller...")
-                        break
-                else:
-                    exit_start = None
-
-                # Use local counters captured by closure via mutable types
-                if gesture != current_gesture:
-                    zoom_in_frames = 0
-                    zoom_out_frames = 0
-                    fist_frames = 0
-                    current_gesture = gesture
-
-                if gesture == "zoom_in":
-                    zoom_in_frames += 1
-                    zoom_out_frames = 0
-                    fist_frames = 0
-                elif gesture == "zoom_out":
-                    zoom_out_frames += 1
-                    zoom_in_frames = 0
-                    fist_frames = 0
-                elif gesture == "fist":
-                    fist_frames += 1
-                    zoom_in_frames = 0
-                    zoom_out_frames = 0
-                else:
-                    zoom_in_frames = 0
-                    zoom_out_frames = 0
-                    fist_frames = 0
-                    current_gesture = None
-
-                if (current_time - last_action_time) >= ZOOM_COOLDOWN:
-                    if zoom_in_frames >= GESTURE_FRAMES_REQUIRED:
-                        zoom_in()
-                        print(f"ZOOM IN - Gesture held for {zoom_in_frames} frames")
-                        last_action_time = current_time
-                        zoom_in_frames = 0
-                        current_gesture = None
-                    elif zoom_out_frames >= GESTURE_FRAMES_REQUIRED:
-                        zoom_out()
-                        print(f"ZOOM OUT - Gesture held for {zoom_out_frames} frames")
-                        last_action_time = current_time
-                        zoom_out_frames = 0
-                        current_gesture = None
-
-                if fist_frames >= GESTURE_FRAMES_REQUIRED:
-                    print("Exiting Zoom Mode...")
-                    break
+        else:
+            counters[:] = 0
+            current_gesture = GESTURE_NONE
 
-            else:
-                zoom_in_frames = 0
-                zoom_out_frames = 0
-                fist_frames = 0
-                current_gesture = None
+        if hud is None or not hud.fits(frame):
+            hud = StaticOverlay(h, w, draw_hud)
+        hud.apply(frame)
 
-            cv2.putText(frame, "ZOOM MODE - ACTIVE", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
-            cv2.putText(frame, "Fist to EXIT", (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
+        if show_frame("Gesture Control - Zoom Mode", frame, 27):
+            break
 
-            cv2.imshow("Gesture Control - Zoom Mode", frame)
-            key = cv2.waitKey(1) & 0xFF
-            if key == 27:
-                break
+    pipeline.stop()
+    release(hands)
 
-    cap.release()
+    if own_cap:
+        cap.release()
     cv2.destroyAllWindows()
 
 
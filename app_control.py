@@ -3,6 +3,8 @@ import mediapipe as mp
 import pyautogui
 import time
 
+from frame_pipeline import open_camera
+
 pyautogui.FAILSAFE = False
 
 mp_hands = mp.solutions.hands
@@ -27,9 +29,10 @@ def run_app_control():
     hands = mp_hands.Hands(
         max_num_hands=1,
         min_detection_confidence=0.7,
-        min_tracking_confidence=0.7
+        min_tracking_confidence=0.7,
+        model_complexity=0  # lite model: plenty for finger up/down checks
     )
-    cap = cv2.VideoCapture(0)
+    cap = open_camera()
 
     last_switch = 0
     cooldown    = 1.2   # seconds between switches
@@ -1,83 +1,88 @@
 import cv2
-import mediapipe as mp
+import numpy as np
 import pyautogui
 import time
 
-pyautogui.FAILSAFE = False
-
-# Initialize MediaPipe Hand Landmarker
-BaseOptions = mp.tasks.BaseOptions
-HandLandmarker = mp.tasks.vision.HandLandmarker
-HandLandmarkerOptions = mp.tasks.vision.HandLandmarkerOptions
-VisionRunningMode = mp.tasks.vision.RunningMode
+from frame_pipeline import open_camera
+from hand_detector_pool import get_hands, release
+from overlay import SHOW_UI, draw_hand, show_frame
 
-options = HandLandmarkerOptions(
-    base_options=BaseOptions(model_asset_path='hand_landmarker.task'),
-    running_mode=VisionRunningMode.IMAGE,
-    num_hands=1,
-    min_hand_detection_confidence=0.7,
-    min_hand_presence_confidence=0.7,
-    min_tracking_confidence=0.7
-)
+pyautogui.FAILSAFE = False
 
-detector = HandLandmarker.create_from_options(options)
+# Initialize MediaPipe Hand Landmarker. LIVE_STREAM mode: detect_async()
+# returns immediately and the tracker keeps the newest result, so the next
+# frame is captured while inference runs.
+detector = get_hands(max_hands=1, det=0.7, track=0.7, running_mode="live_stream")
 
-cap = cv2.VideoCapture(0)
+cap = open_camera()
 
 last_switch = 0
 cooldown = 1.2
 
+# Per-frame scratch buffers; the preview flip buffer is allocated on first use
+INFER_W, INFER_H = 320, 240
+flip_buf = None
+small_buf = np.empty((INFER_H, INFER_W, 3), dtype=np.uint8)
+rgb_buf = np.empty((INFER_H, INFER_W, 3), dtype=np.uint8)
+
 while True:
     success, img = cap.read()
     if not success:
         continue
 
-    img = cv2.flip(img, 1)
+    # One monotonic clock read per frame, shared by MediaPipe and the cooldown
+    now = time.monotonic()
+
+    # The camera frame stays unmirrored: inference does not care, so the
+    # selfie-view flip is only paid for the preview (see below) and the
+    # gesture logic mirrors x itself
     h, w, _ = img.shape
 
-    # Convert to MediaPipe Image format
-    mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=img)
+    # Landmarks are normalized, so inference can run on a downscaled copy
+    # while the full-resolution frame is kept for display
+    cv2.resize(img, (INFER_W, INFER_H), dst=small_buf, interpolation=cv2.INTER_AREA)
+
+    # SRGB expects RGB channel order
+    cv2.cvtColor(small_buf, cv2.COLOR_BGR2RGB, dst=rgb_buf)
 
-    # Detect hand landmarks
-    results = detector.detect(mp_image)
+    # Returns whichever result is freshest (may lag the displayed frame by one)
+    results = detector.process(rgb_buf, now)
 
     if results.hand_landmarks:
         for hand_landmarks in results.hand_landmarks:
             # Draw landmarks
-            mp.tasks.vision.draw_landmarks(
-                img,
-                hand_landmarks,
-                mp.tasks.vision.HandLandmarksConnections.HAND_CONNECTIONS,
-                mp.tasks.vision.drawing_styles.get_default_hand_landmarks_style(),
-                mp.tasks.vision.drawing_styles.get_default_hand_connections_style()
-            )
+            draw_hand(img, hand_landmarks, color=(0, 255, 0))
 
             # Get index finger tip coordinates
             index_finger_tip = hand_landmarks[8]  # Index finger tip landmark
-            x = int(index_finger_tip.x * w)
+            raw_x = int(index_finger_tip.x * w)
             y = int(index_finger_tip.y * h)
 
-            cv2.circle(img, (x, y), 10, (0, 255, 0), cv2.FILLED)
+            # Drawn in camera space; it is mirrored along with the frame
+            cv2.circle(img, (raw_x, y), 10, (0, 255, 0), cv2.FILLED)
 
-            current_time = time.time()
+            # Selfie-view x, as the user sees it
+            x = w - raw_x
 
-            if current_time - last_switch > cooldown:
+            if now - last_switch > cooldown:
 
                 if x > w - 150:
                     pyautogui.hotkey('alt', 'tab')
-                    last_switch = current_time
+                    last_switch = now
                     print("Next App")
 
                 elif x < 150:
                     pyautogui.hotkey('alt', 'shift', 'tab')
-                    last_switch = current_time
+                    last_switch = now
                     print("Previous App")
 
-    cv2.imshow("App Switch Gesture Control", img)
-
-    if cv2.waitKey(1) & 0xFF == ord('q'):
+    if SHOW_UI:
+        if flip_buf is None:
+            flip_buf = np.empty_like(img)
+        img = cv2.flip(img, 1, dst=flip_buf)
+    if show_frame("App Switch Gesture Control", img, ord('q')):
         break
 
 cap.release()
 cv2.destroyAllWindows()
-detector.close()
\ No newline at end of file
+release(detector)
\ No newline at end of file
@@ -0,0 +1,382 @@
+"""frame_pipeline.py
+Threaded capture → inference pipeline shared by the gesture modes.
+
+`cap.read()` and `hands.process()` each block for a large part of a frame
+period.  Running them on their own threads, joined by single-slot queues that
+always keep the newest item, lets USB transfer, colour conversion and MediaPipe
+inference overlap instead of queueing up behind each other.  The caller's
+thread only consumes `(frame, result)` pairs and keeps the gesture logic,
+pyautogui calls and `cv2.imshow`.
+"""
+
+import queue
+import sys
+import threading
+import time
+
+import cv2
+import numpy as np
+
+
+if sys.platform == "win32":
+    _PREFERRED_BACKEND = cv2.CAP_DSHOW
+elif sys.platform.startswith("linux"):
+    _PREFERRED_BACKEND = cv2.CAP_V4L2
+else:
+    _PREFERRED_BACKEND = cv2.CAP_ANY
+
+
+def open_camera(index=0, width=640, height=480, fps=30):
+    """Open a webcam configured for low-latency MJPG capture.
+
+    MJPG lets the camera compress in hardware instead of shipping raw YUYV
+    over USB, and a single-frame driver buffer keeps `read()` from returning
+    stale frames.  Backends that ignore a setting simply keep their default.
+
+    DirectShow (Windows) and V4L2 (Linux) are requested explicitly: they
+    honour the FOURCC/buffer settings, whereas the default MSMF backend on
+    Windows tends to ignore MJPG.  Falls back to the default backend if the
+    preferred one cannot open the camera.
+    """
+    cap = cv2.VideoCapture(index, _PREFERRED_BACKEND)
+    if not cap.isOpened() and _PREFERRED_BACKEND != cv2.CAP_ANY:
+        cap.release()
+        cap = cv2.VideoCapture(index)
+    cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+    cap.set(cv2.CAP_PROP_FPS, fps)
+    if not cap.set(cv2.CAP_PROP_BUFFERSIZE, 1) and cap.isOpened():
+        # Without it the driver queues frames and read() lags behind
+        print("[Camera] BUFFERSIZE=1 not accepted, frames may arrive late")
+
+    fourcc = int(cap.get(cv2.CAP_PROP_FOURCC))
+    if cap.isOpened() and fourcc != cv2.VideoWriter_fourcc(*'MJPG'):
+        codec = "".join(chr((fourcc >> (8 * i)) & 0xFF) for i in range(4))
+        print(f"[Camera] MJPG not accepted, capturing as '{codec}'")
+    return cap
+
+
+def put_latest(q, item):
+    """Put `item` on a size-1 queue, dropping whatever is still waiting."""
+    try:
+        q.put_nowait(item)
+    except queue.Full:
+        try:
+            q.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            q.put_nowait(item)
+        except queue.Full:
+            pass
+
+
+def has_hand(result):
+    """True if a Tasks-style (`hand_landmarks`) or Solutions result found a hand."""
+    hands = getattr(result, "hand_landmarks", None)
+    if hands is None:
+        hands = result.multi_hand_landmarks
+    return bool(hands)
+
+
+def first_hand(result):
+    """Landmarks of the first hand in a Tasks or Solutions result, or None."""
+    hands = getattr(result, "hand_landmarks", None)
+    if hands is None:
+        hands = result.multi_hand_landmarks
+        return hands[0].landmark if hands else None
+    return hands[0] if hands else None
+
+
+class CaptureThread(threading.Thread):
+    """Reads the camera continuously and publishes `(frame, timestamp)`.
+
+    With `max_fps` set, every frame is still `grab()`bed so the driver
+    buffer stays drained, but only frames due at that rate are
+    `retrieve()`d; the rest are never decoded.
+
+    Publishes `None` and stops when the camera stops delivering frames.
+    """
+
+    def __init__(self, cap, stop_event=None, max_fps=None):
+        super().__init__(daemon=True)
+        self.cap = cap
+        self.stop_event = stop_event or threading.Event()
+        self.frames = queue.Queue(maxsize=1)
+        self.interval = 1.0 / max_fps if max_fps else 0.0
+
+    def run(self):
+        next_due = 0.0
+        while not self.stop_event.is_set():
+            if not self.cap.grab():
+                put_latest(self.frames, None)
+                return
+            now = time.monotonic()
+            if now < next_due:
+                continue
+            ok, frame = self.cap.retrieve()
+            if not ok:
+                put_latest(self.frames, None)
+                return
+            next_due = now + self.interval
+            put_latest(self.frames, (frame, now))
+
+    def read(self):
+        """Block until the newest `(frame, timestamp)` is ready.
+
+        Used standalone, when the consumer runs inference itself.  Returns
+        None once the camera has stopped delivering frames.
+        """
+        while True:
+            try:
+                return self.frames.get(timeout=0.5)
+            except queue.Empty:
+                if not self.is_alive():
+                    return None
+
+    def stop(self):
+        """Stop grabbing; must be called before releasing the camera."""
+        self.stop_event.set()
+        if self.is_alive():
+            self.join(timeout=1.0)
+
+
+class IdleGate:
+    """Cheap test for whether a frame without a tracked hand is worth inferring.
+
+    While nobody is gesturing the palm detector still costs several
+    milliseconds per frame.  The frame is shrunk to `size` and checked for
+    motion against the previous one and for skin-coloured pixels (YCrCb
+    range); only frames with both are passed on.  Every `recheck_every`
+    rejected frames one is passed anyway, so a hand that came to rest
+    before it was detected is still picked up.
+    """
+
+    SKIN_LO = np.array([0, 133, 77], dtype=np.uint8)
+    SKIN_HI = np.array([255, 173, 127], dtype=np.uint8)
+
+    def __init__(self, size=(64, 48), diff_thresh=15, min_motion=0.002,
+                 min_skin=0.01, recheck_every=15):
+        w, h = size
+        self.size = size
+        self.diff_thresh = diff_thresh
+        self.min_motion_px = max(1, int(min_motion * w * h))
+        self.min_skin_px = max(1, int(min_skin * w * h))
+        self.recheck_every = recheck_every
+        self._tiny = np.empty((h, w, 3), dtype=np.uint8)
+        self._ycrcb = np.empty((h, w, 3), dtype=np.uint8)
+        self._gray = np.empty((h, w), dtype=np.uint8)
+        self._prev = np.empty((h, w), dtype=np.uint8)
+        self._diff = np.empty((h, w), dtype=np.uint8)
+        self._has_prev = False
+        self._rejected = 0
+
+    def should_infer(self, frame):
+        cv2.resize(frame, self.size, dst=self._tiny, interpolation=cv2.INTER_AREA)
+        cv2.cvtColor(self._tiny, cv2.COLOR_BGR2GRAY, dst=self._gray)
+        moving = True
+        if self._has_prev:
+            cv2.absdiff(self._gray, self._prev, dst=self._diff)
+            cv2.threshold(self._diff, self.diff_thresh, 255, cv2.THRESH_BINARY, dst=self._diff)
+            moving = cv2.countNonZero(self._diff) >= self.min_motion_px
+        self._gray, self._prev = self._prev, self._gray
+        self._has_prev = True
+
+        if moving:
+            cv2.cvtColor(self._tiny, cv2.COLOR_BGR2YCrCb, dst=self._ycrcb)
+            cv2.inRange(self._ycrcb, self.SKIN_LO, self.SKIN_HI, dst=self._diff)
+            if cv2.countNonZero(self._diff) >= self.min_skin_px:
+                self._rejected = 0
+                return True
+
+        self._rejected += 1
+        if self._rejected >= self.recheck_every:
+            self._rejected = 0
+            return True
+        return False
+
+
+class StillGate:
+    """Tells whether a frame changed enough since the last inference to redo it.
+
+    During hold-to-confirm gestures the hand barely moves, so the previous
+    landmarks are still valid.  The frame is shrunk to a `size` grayscale
+    thumbnail and compared with the thumbnail of the last inferred frame;
+    below `min_mean_diff` (mean absolute difference, 0-255) the old result
+    is reused.  Comparing against the last inferred frame rather than the
+    previous one keeps slow drift from being skipped indefinitely, and
+    `max_age` seconds force a fresh inference regardless.
+
+    The mean is taken over the last detected hand's bounding box, grown by
+    `margin` of its size on each side (see `track`), not the whole frame: a
+    finger folding on a small hand barely moves a whole-frame mean, so it
+    would otherwise wait out `max_age` before being seen.
+    """
+
+    def __init__(self, size=(80, 60), min_mean_diff=2.0, max_age=0.5, margin=0.25):
+        w, h = size
+        self.size = size
+        self.min_mean_diff = min_mean_diff
+        self.max_age = max_age
+        self.margin = margin
+        self._roi = None
+        self._tiny = np.empty((h, w, 3), dtype=np.uint8)
+        self._gray = np.empty((h, w), dtype=np.uint8)
+        self._ref = np.empty((h, w), dtype=np.uint8)
+        self._diff = np.empty((h, w), dtype=np.uint8)
+        self._ref_time = None
+
+    def changed(self, frame, now):
+        cv2.resize(frame, self.size, dst=self._tiny, interpolation=cv2.INTER_AREA)
+        cv2.cvtColor(self._tiny, cv2.COLOR_BGR2GRAY, dst=self._gray)
+        if self._ref_time is not None and now - self._ref_time < self.max_age:
+            cv2.absdiff(self._gray, self._ref, dst=self._diff)
+            diff = self._diff if self._roi is None else self._diff[self._roi]
+            if cv2.mean(diff)[0] < self.min_mean_diff:
+                return False
+        self._gray, self._ref = self._ref, self._gray
+        self._ref_time = now
+        return True
+
+    def track(self, landmarks):
+        """Compare only around `landmarks` from now on (whole frame for None)."""
+        self._roi = None
+        if landmarks is None:
+            return
+        xs = [p.x for p in landmarks]
+        ys = [p.y for p in landmarks]
+        x0, x1, y0, y1 = min(xs), max(xs), min(ys), max(ys)
+        mx = (x1 - x0) * self.margin
+        my = (y1 - y0) * self.margin
+        w, h = self.size
+        c0, c1 = max(0, int((x0 - mx) * w)), min(w, int((x1 + mx) * w) + 1)
+        r0, r1 = max(0, int((y0 - my) * h)), min(h, int((y1 + my) * h) + 1)
+        if c0 < c1 and r0 < r1:
+            self._roi = (slice(r0, r1), slice(c0, c1))
+
+
+# MediaPipe resizes to 192/256 px internally; handing it a smaller frame cuts
+# the colour-conversion and pybind copy cost without changing the normalized
+# landmark coordinates.
+INFER_SIZE = (320, 240)
+
+
+class InferThread(threading.Thread):
+    """Mirrors each frame, runs MediaPipe on it and publishes the result.
+
+    Publishes `(frame, result, timestamp)` where `frame` is the full-size
+    mirrored BGR frame for display, or `None` once the capture side has
+    stopped.  Inference runs on a copy downscaled to `infer_size`.
+
+    With `infer_every > 1`, MediaPipe only runs on every Nth frame while a
+    hand is being tracked (and on every frame while it is not); skipped
+    frames are published with `result=None` so the consumer can carry the
+    last position forward itself.  With `idle_gate`, frames are also skipped
+    while no hand is tracked and the `IdleGate` sees nothing hand-like;
+    with `still_gate`, while a hand is tracked but the `StillGate` sees no
+    change since the last inference.
+    """
+
+    def __init__(self, hands, frames, stop_event, infer_size=INFER_SIZE,
+                 infer_every=1, idle_gate=False, still_gate=False):
+        super().__init__(daemon=True)
+        self.hands = hands
+        self.frames = frames
+        self.stop_event = stop_event
+        self.infer_size = infer_size
+        self.infer_every = infer_every
+        self.results = queue.Queue(maxsize=1)
+        self._frame_idx = 0
+        self._had_hand = False
+        # The gates only start once a real result has been published, so a
+        # dark warm-up frame cannot hold back the first detection.  The
+        # single-slot queue may still replace that result with a skipped
+        # frame before it is read: consumers treat result=None with no
+        # earlier result as "no hand"
+        self._inferred = False
+        self._gate = IdleGate() if idle_gate else None
+        self._still = StillGate() if still_gate else None
+
+        # Scratch buffers for the inference-only copies, reused every frame.
+        # The mirrored frame itself is handed to the consumer, so it cannot
+        # be recycled here.
+        w, h = infer_size
+        self._small_buf = np.empty((h, w, 3), dtype=np.uint8)
+        self._rgb_buf = np.empty((h, w, 3), dtype=np.uint8)
+
+    def run(self):
+        while not self.stop_event.is_set():
+            try:
+                item = self.frames.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if item is None:
+                put_latest(self.results, None)
+                return
+
+            frame, ts = item
+            frame = cv2.flip(frame, 1)
+
+            self._frame_idx += 1
+            if not self._inferred:
+                skip = False
+            elif self._had_hand:
+                skip = (self._frame_idx % self.infer_every
+                        or (self._still is not None and not self._still.changed(frame, ts)))
+            else:
+                skip = self._gate is not None and not self._gate.should_infer(frame)
+            if skip:
+                put_latest(self.results, (frame, None, ts))
+                continue
+
+            cv2.resize(frame, self.infer_size, dst=self._small_buf,
+                       interpolation=cv2.INTER_AREA)
+            # Writable only while being filled, so nothing else can modify the
+            # buffer while it is being handed over (mp.Image copies the data)
+            self._rgb_buf.flags.writeable = True
+            cv2.cvtColor(self._small_buf, cv2.COLOR_BGR2RGB, dst=self._rgb_buf)
+            self._rgb_buf.flags.writeable = False
+            result = self.hands.process(self._rgb_buf)
+            self._had_hand = has_hand(result)
+            if self._still is not None:
+                self._still.track(first_hand(result))
+            self._inferred = True
+            put_latest(self.results, (frame, result, ts))
+
+
+class HandPipeline:
+    """Owns a CaptureThread + InferThread pair for one camera and detector."""
+
+    def __init__(self, cap, hands, infer_size=INFER_SIZE, infer_every=1,
+                 max_fps=None, idle_gate=False, still_gate=False):
+        # OpenCV's own worker pool would fight the pipeline threads for cores
+        cv2.setNumThreads(1)
+        self.stop_event = threading.Event()
+        self.capture = CaptureThread(cap, self.stop_event, max_fps)
+        self.infer = InferThread(hands, self.capture.frames, self.stop_event,
+                                 infer_size, infer_every, idle_gate, still_gate)
+
+    def start(self):
+        self.capture.start()
+        self.infer.start()
+        return self
+
+    def read(self):
+        """Block until the next `(frame, result, timestamp)` is ready.
+
+        Returns None once the camera has stopped delivering frames.
+        """
+        while True:
+            try:
+                return self.infer.results.get(timeout=0.5)
+            except queue.Empty:
+                if not self.infer.is_alive():
+                    return None
+
+    def stop(self):
+        """Stop both threads; must be called before releasing the camera."""
+        self.stop_event.set()
+        for t in (self.capture, self.infer):
+            if t.is_alive():
+                t.join(timeout=1.0)
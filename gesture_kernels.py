@@ -0,0 +1,218 @@
+"""gesture_kernels.py
+Small per-frame gesture kernels, compiled with numba when it is installed.
+
+These run on every processed frame, so they are written as plain scalar /
+ndarray code that numba's `njit` can compile to native code.  Without numba
+the same functions run as ordinary Python.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except Exception:
+    njit = None
+
+if njit is None:
+    def njit(*args, **kwargs):
+        # Identity decorator, usable both bare and with keyword arguments
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda fn: fn
+
+
+def landmarks_to_array(landmarks, out=None):
+    """Copy the 21 normalized (x, y) landmarks into a (21, 2) array in one pass.
+
+    `landmarks` is a Tasks `hand_landmarks[i]` list or a Solutions
+    `hand.landmark`; reading every attribute once here keeps the per-finger
+    tests down to array slicing.  With `out`, a C-contiguous (21, 2)
+    float32 array, the coordinates are written into it instead of a new one.
+    """
+    if out is not None:
+        out.reshape(42)[:] = [c for lm in landmarks for c in (lm.x, lm.y)]
+        return out
+    return np.fromiter(
+        (c for lm in landmarks for c in (lm.x, lm.y)),
+        dtype=np.float32, count=42
+    ).reshape(21, 2)
+
+
+# Index, middle, ring, pinky tips and their PIP joints, as index arrays so
+# `pts[TIP_IDS, 1]` is a single fancy-indexing gather
+TIP_IDS = np.array([8, 12, 16, 20], dtype=np.intp)
+PIP_IDS = np.array([6, 10, 14, 18], dtype=np.intp)
+
+# Finger state packed as (thumb<<4)|(index<<3)|(middle<<2)|(ring<<1)|pinky
+FINGER_BITS = np.array([16, 8, 4, 2, 1], dtype=np.int32)
+
+
+def finger_code(fingers):
+    """Pack a [thumb, index, middle, ring, pinky] bool array into a 5-bit int."""
+    return int(FINGER_BITS @ fingers)
+
+
+@njit(cache=True)
+def span_finger_code(pts, thumb_span, tip_margin):
+    """5-bit finger code straight from a (21, 2) landmark array.
+
+    The thumb counts as up when its tip is more than `thumb_span` away from
+    its MCP horizontally; the other fingers when their tip is more than
+    `tip_margin` above their PIP joint.  Fuses the finger tests and the bit
+    packing into one compiled call.
+    """
+    code = 0
+    if abs(pts[4, 0] - pts[2, 0]) > thumb_span:
+        code |= 16
+    for i in range(4):
+        # Tips are 8, 12, 16, 20; their PIP joints sit two landmarks below
+        if pts[8 + 4 * i, 1] < pts[6 + 4 * i, 1] - tip_margin:
+            code |= 8 >> i
+    return code
+
+
+@njit(cache=True)
+def fold_finger_code(pts, tip_margin):
+    """5-bit finger code with the thumb judged by its IP joint.
+
+    The thumb counts as up when its tip lies left of its IP joint (true for
+    a right hand in the mirrored preview); the other fingers when their tip
+    is more than `tip_margin` above their PIP joint.  Works on normalized or
+    pixel landmarks, as long as `tip_margin` is in the same units.
+    """
+    code = 0
+    if pts[4, 0] < pts[3, 0]:
+        code |= 16
+    for i in range(4):
+        if pts[8 + 4 * i, 1] < pts[6 + 4 * i, 1] - tip_margin:
+            code |= 8 >> i
+    return code
+
+
+@njit(cache=True)
+def hand_size(pts, min_size):
+    """Wrist to middle-finger MCP distance, at least `min_size`.
+
+    Used as the reference length so pinch and fist thresholds scale with
+    the hand's distance from the camera.
+    """
+    dx = pts[9, 0] - pts[0, 0]
+    dy = pts[9, 1] - pts[0, 1]
+    return max((dx * dx + dy * dy) ** 0.5, min_size)
+
+
+@njit(cache=True)
+def pinch_distance(pts):
+    """Thumb tip to index tip distance."""
+    dx = pts[4, 0] - pts[8, 0]
+    dy = pts[4, 1] - pts[8, 1]
+    return (dx * dx + dy * dy) ** 0.5
+
+
+@njit(cache=True)
+def tip_wrist_distance(pts):
+    """Mean distance from the four fingertips to the wrist."""
+    total = 0.0
+    for i in range(4):
+        dx = pts[8 + 4 * i, 0] - pts[0, 0]
+        dy = pts[8 + 4 * i, 1] - pts[0, 1]
+        total += (dx * dx + dy * dy) ** 0.5
+    return total / 4.0
+
+
+@njit(cache=True)
+def hand_features(pts, w, h, fist_ratio, pinch_ratio):
+    """Everything the pinch-driven modes need from one hand, in one call.
+
+    Returns `(code, fist, pinch, px, py)`: the `fold_finger_code` with no
+    tip margin, whether the mean tip-wrist distance is under `fist_ratio`
+    hand sizes, whether the thumb-index distance is under `pinch_ratio`
+    hand sizes, and the index tip in pixels.  `pts` is normalized;
+    distances are measured in pixels of a `w` x `h` frame, with the hand
+    size floored at 20 px.
+    """
+    code = fold_finger_code(pts, 0.0)
+    wx = pts[0, 0] * w
+    wy = pts[0, 1] * h
+    dx = pts[9, 0] * w - wx
+    dy = pts[9, 1] * h - wy
+    size = max((dx * dx + dy * dy) ** 0.5, 20.0)
+
+    total = 0.0
+    for i in range(4):
+        dx = pts[8 + 4 * i, 0] * w - wx
+        dy = pts[8 + 4 * i, 1] * h - wy
+        total += (dx * dx + dy * dy) ** 0.5
+    fist = total / 4.0 < size * fist_ratio
+
+    px = pts[8, 0] * w
+    py = pts[8, 1] * h
+    dx = pts[4, 0] * w - px
+    dy = pts[4, 1] * h - py
+    pinch = (dx * dx + dy * dy) ** 0.5 < size * pinch_ratio
+    return code, fist, pinch, px, py
+
+
+def warm_up():
+    """Compile the landmark kernels now rather than on the first hand.
+
+    With numba's on-disk cache this only loads the compiled code after the
+    first run.  Without numba it is a few cheap Python calls.
+    """
+    pts = np.zeros((21, 2), dtype=np.float32)
+    span_finger_code(pts, 0.0, 0.0)
+    fold_finger_code(pts, 0.0)
+    hand_size(pts, 1.0)
+    pinch_distance(pts)
+    tip_wrist_distance(pts)
+    hand_features(pts, 640, 480, 0.75, 0.28)
+
+
+def code_to_fingers(code):
+    """Unpack a 5-bit finger code into a [thumb, ..., pinky] bool array."""
+    return (code & FINGER_BITS) != 0
+
+
+# Zoom-mode gesture ids (index into the counters array is id - 1)
+GESTURE_NONE = 0
+GESTURE_ZOOM_IN = 1
+GESTURE_ZOOM_OUT = 2
+GESTURE_FIST = 3
+
+# Actions returned by update_zoom_fsm
+ACTION_NONE = 0
+ACTION_ZOOM_IN = 1
+ACTION_ZOOM_OUT = 2
+ACTION_EXIT = 3
+
+
+def new_zoom_counters():
+    """Hold counters for [zoom_in, zoom_out, fist]."""
+    return np.zeros(3, dtype=np.int32)
+
+
+@njit(cache=True)
+def update_zoom_fsm(gesture, prev, counters, frames_required, cooldown_ok):
+    """Advance the zoom-mode hold counters by one frame.
+
+    Returns `(new_prev, action)`.  A gesture has to be held for
+    `frames_required` consecutive frames; zoom actions additionally need
+    `cooldown_ok`.  After a zoom action the current gesture is cleared, so
+    the next frame starts a fresh hold.
+    """
+    if gesture != prev:
+        counters[:] = 0
+        prev = gesture
+    if gesture == GESTURE_NONE:
+        return prev, ACTION_NONE
+
+    counters[gesture - 1] += 1
+
+    if cooldown_ok:
+        if counters[0] >= frames_required:
+            return GESTURE_NONE, ACTION_ZOOM_IN
+        if counters[1] >= frames_required:
+            return GESTURE_NONE, ACTION_ZOOM_OUT
+    if counters[2] >= frames_required:
+        return prev, ACTION_EXIT
+    return prev, ACTION_NONE
@@ -0,0 +1,106 @@
+"""gesture_loop.py
+Shared camera → MediaPipe → gesture-callback loop for the simple modes.
+
+Scroll mode and slide travel each carried their own copy of the same
+skeleton: open the camera, mirror, downscale, run MediaPipe on some frames,
+draw the hand, watch for the master-exit gesture and pump the preview.
+`GestureLoop` owns that skeleton on top of `frame_pipeline.HandPipeline`, so
+a mode only supplies what it does with a detected hand, and pipeline-level
+changes apply to every mode at once.
+"""
+
+import cv2
+
+from frame_pipeline import HandPipeline, open_camera
+from gesture_kernels import fold_finger_code, landmarks_to_array, warm_up
+from hand_detector_pool import release
+from overlay import draw_hand, show_frame
+
+# Thumb + Index + Pinky up, middle and ring down
+EXIT_CODE = 0b11001
+
+
+def fingers_up(pts):
+    """Finger state as a 5-bit code, (thumb<<4)|(index<<3)|...|pinky.
+
+    Thumb compares tip x with its IP joint; other fingers compare tip y with
+    their PIP joint.  `pts` is a (21, 2) normalized landmark array.  Modes
+    dispatch on the integer with one dict lookup instead of comparing lists.
+    """
+    return fold_finger_code(pts, 0.0)
+
+
+class GestureLoop:
+    """Runs one gesture mode until ESC or the master-exit gesture.
+
+    `on_hand(frame, pts, code, now)` is called for every detected hand
+    with its (21, 2) normalized landmarks, its `fingers_up` code and the
+    frame's `time.monotonic()` stamp; `on_no_hand(frame, now)` on frames
+    without one, and `on_frame(frame)` on every frame just before it is
+    shown.  The master-exit gesture has to be held for `exit_hold` seconds.
+
+    A camera passed in stays open for the caller afterwards; the detector is
+    always handed back to the pool.
+    """
+
+    def __init__(self, title, hands, on_hand, on_no_hand=None, on_frame=None,
+                 cap=None, exit_hold=0.0, infer_every=2):
+        self.title = title
+        self.hands = hands
+        self.on_hand = on_hand
+        self.on_no_hand = on_no_hand
+        self.on_frame = on_frame
+        self.cap = cap
+        self.exit_hold = exit_hold
+        self.infer_every = infer_every
+
+    def run(self):
+        warm_up()
+        own_cap = self.cap is None
+        cap = open_camera() if own_cap else self.cap
+        # Mirroring, downscaling and inference run on the pipeline threads;
+        # frames it skips (off-cadence, idle or unchanged) arrive with
+        # result=None and reuse the last one
+        pipeline = HandPipeline(cap, self.hands, infer_every=self.infer_every,
+                                idle_gate=True, still_gate=True).start()
+        result = None
+        exit_start = None
+        try:
+            while True:
+                item = pipeline.read()
+                if item is None:
+                    break
+                frame, new_result, now = item
+                if new_result is not None:
+                    result = new_result
+
+                if result is not None and result.hand_landmarks:
+                    for hand_landmarks in result.hand_landmarks:
+                        draw_hand(frame, hand_landmarks)
+                        pts = landmarks_to_array(hand_landmarks)
+                        code = fingers_up(pts)
+
+                        if code == EXIT_CODE:
+                            if exit_start is None:
+                                exit_start = now
+                            if now - exit_start >= self.exit_hold:
+                                print("Master-exit gesture held — returning to master controller...")
+                                return
+                        else:
+                            exit_start = None
+
+                        self.on_hand(frame, pts, code, now)
+                elif self.on_no_hand is not None:
+                    self.on_no_hand(frame, now)
+
+                if self.on_frame is not None:
+                    self.on_frame(frame)
+                if show_frame(self.title, frame, 27):  # ESC
+                    break
+        finally:
+            # The pipeline must stop before the camera goes away under it
+            pipeline.stop()
+            if own_cap:
+                cap.release()
+            release(self.hands)
+            cv2.destroyAllWindows()
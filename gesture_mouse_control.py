@@ -1,27 +1,26 @@
 import cv2
-import mediapipe as mp
+import numpy as np
 import pyautogui
-import math
-import time
 
-# Initialize MediaPipe Hand Detection
-mp_hands = mp.solutions.hands
-hands = mp_hands.Hands(
-    static_image_mode=False,
-    max_num_hands=1,
-    min_detection_confidence=0.5,  # Lower for more stable tracking
-    min_tracking_confidence=0.3    # Lower for smoother continuous tracking
-)
-mp_drawing = mp.solutions.drawing_utils
+from frame_pipeline import HandPipeline, open_camera
+from hand_detector_pool import get_hands, release
+from native_input import move_cursor
+from overlay import StaticOverlay, draw_hand, show_frame
+
+# The cursor is driven every frame; skip pyautogui's per-call sleep and corner failsafe
+pyautogui.PAUSE = 0
+pyautogui.FAILSAFE = False
 
 # Get screen dimensions
 screen_width, screen_height = pyautogui.size()
 
-def distance_between_points(point1, point2):
-    """Calculate Euclidean distance between two points"""
-    return math.sqrt((point1[0] - point2[0])**2 + (point1[1] - point2[1])**2)
+# Largest valid cursor coordinates, used for the single clamp in map_to_screen
+SCREEN_MAX_X, SCREEN_MAX_Y = screen_width - 1, screen_height - 1
+
+# Pinch threshold in normalized units, compared squared to skip the sqrt
+PINCH_THRESHOLD_SQ = 0.06 * 0.06
 
-def is_pinch_detected(hand_landmarks):
+def is_pinch_detected(landmarks):
     """
     Detect if thumb and index finger are pinched together
     Returns True if distance between thumb tip and index tip is small
@@ -32,23 +31,17 @@ def is_pinch_detected(hand_landmarks):
     THUMB_IP = 3
     INDEX_PIP = 6
     
-    landmarks = hand_landmarks.landmark
-    
-    # Get positions
-    thumb_tip = (landmarks[THUMB_TIP].x, landmarks[THUMB_TIP].y)
-    thumb_ip = (landmarks[THUMB_IP].x, landmarks[THUMB_IP].y)
-    index_tip = (landmarks[INDEX_TIP].x, landmarks[INDEX_TIP].y)
-    index_pip = (landmarks[INDEX_PIP].x, landmarks[INDEX_PIP].y)
-    
-    # Calculate distances (normalized 0-1 range)
-    distance = distance_between_points(thumb_tip, index_tip)
+    thumb_tip = landmarks[THUMB_TIP]
+    index_tip = landmarks[INDEX_TIP]
     
-    # Also check if both fingers are extended
-    thumb_extended = landmarks[THUMB_TIP].y < landmarks[THUMB_IP].y
-    index_extended = landmarks[INDEX_TIP].y < landmarks[INDEX_PIP].y
+    # Squared distance (normalized 0-1 range)
+    dx = thumb_tip.x - index_tip.x
+    dy = thumb_tip.y - index_tip.y
     
     # Pinch detected if distance is small AND both fingers are extended
-    return distance < 0.06 and thumb_extended and index_extended
+    return (dx * dx + dy * dy < PINCH_THRESHOLD_SQ
+            and thumb_tip.y < landmarks[THUMB_IP].y
+            and index_tip.y < landmarks[INDEX_PIP].y)
 
 def get_index_finger_position(hand_landmarks, frame_width, frame_height):
     """
@@ -56,31 +49,25 @@ def get_index_finger_position(hand_landmarks, frame_width, frame_height):
     Returns coordinates scaled to screen resolution with full screen coverage
     """
     INDEX_TIP = 8
-    landmark = hand_landmarks.landmark[INDEX_TIP]
-    
+    landmark = hand_landmarks[INDEX_TIP]
+    return map_to_screen(landmark.x, landmark.y, frame_width, frame_height)
+
+def map_to_screen(x, y, frame_width, frame_height):
+    """
+    Map a normalized fingertip position to screen and frame coordinates
+    """
     # MediaPipe returns normalized coordinates (0-1 range)
     # x: 0 = left, 1 = right (already correct for mirrored camera view)
     # y: 0 = top, 1 = bottom
     
-    # Use 1 - x for proper left-right mapping (camera is mirrored)
-    normalized_x = 1.0 - landmark.x
-    normalized_y = landmark.y
-    
-    # Clamp values to ensure they stay within 0-1 range
-    normalized_x = max(0.0, min(1.0, normalized_x))
-    normalized_y = max(0.0, min(1.0, normalized_y))
-    
-    # Direct mapping to screen coordinates with slight padding for edge detection
-    screen_x = int(normalized_x * screen_width)
-    screen_y = int(normalized_y * screen_height)
-    
-    # Ensure coordinates stay within screen bounds
-    screen_x = max(0, min(screen_width - 1, screen_x))
-    screen_y = max(0, min(screen_height - 1, screen_y))
+    # Use 1 - x for proper left-right mapping (camera is mirrored), then
+    # clamp once in screen space so the cursor can reach every edge
+    screen_x = min(max(int((1.0 - x) * screen_width), 0), SCREEN_MAX_X)
+    screen_y = min(max(int(y * screen_height), 0), SCREEN_MAX_Y)
     
     # Frame coordinates for visualization
-    frame_x = frame_width - int(landmark.x * frame_width)
-    frame_y = int(landmark.y * frame_height)
+    frame_x = frame_width - int(x * frame_width)
+    frame_y = int(y * frame_height)
     
     return screen_x, screen_y, frame_x, frame_y
 
@@ -116,23 +103,73 @@ def draw_cursor(frame, x, y, is_pinching):
             2
         )
 
+def draw_static_hud(frame):
+    """
+    Draw the HUD elements that never change between frames
+    """
+    h, w = frame.shape[:2]
+    
+    # Display screen position info
+    cv2.putText(
+        frame,
+        f"Screen: {screen_width}x{screen_height}",
+        (10, 30),
+        cv2.FONT_HERSHEY_SIMPLEX,
+        0.6,
+        (255, 255, 255),
+        2
+    )
+    
+    # Display smoothing info
+    cv2.putText(
+        frame,
+        "Ultra Smooth EMA Tracking: ACTIVE",
+        (10, 60),
+        cv2.FONT_HERSHEY_SIMPLEX,
+        0.5,
+        (0, 255, 100),
+        1
+    )
+    
+    # Draw screen area guide (corners)
+    corner_size = 20
+    cv2.line(frame, (0, 0), (corner_size, 0), (100, 100, 100), 2)  # Top-left
+    cv2.line(frame, (0, 0), (0, corner_size), (100, 100, 100), 2)
+    cv2.line(frame, (w-1, 0), (w-1-corner_size, 0), (100, 100, 100), 2)  # Top-right
+    cv2.line(frame, (w-1, 0), (w-1, corner_size), (100, 100, 100), 2)
+    cv2.line(frame, (0, h-1), (corner_size, h-1), (100, 100, 100), 2)  # Bottom-left
+    cv2.line(frame, (0, h-1), (0, h-1-corner_size), (100, 100, 100), 2)
+    cv2.line(frame, (w-1, h-1), (w-1-corner_size, h-1), (100, 100, 100), 2)  # Bottom-right
+    cv2.line(frame, (w-1, h-1), (w-1, h-1-corner_size), (100, 100, 100), 2)
+    
+    # Instructions
+    cv2.putText(
+        frame,
+        "Press 'q' to quit",
+        (10, h - 20),
+        cv2.FONT_HERSHEY_SIMPLEX,
+        0.6,
+        (200, 200, 200),
+        2
+    )
+
 def main():
     """
     Main function to run the gesture-based mouse control program
     """
+    pipeline = None
+    # Shared MediaPipe hand detector (Tasks HandLandmarker, GPU delegate when
+    # available); stays loaded across mode switches. Lower confidences give
+    # more stable detection and smoother continuous tracking.
+    hands = get_hands(max_hands=1, det=0.5, track=0.3)
     try:
-        cap = cv2.VideoCapture(0)
+        # MJPG, 640x480 @ 30 FPS, single-frame buffer for low latency
+        cap = open_camera()
         
         if not cap.isOpened():
             print("Error: Could not open camera")
             return
         
-        # Optimize camera settings for low latency
-        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)  # Reduce buffer
-        cap.set(cv2.CAP_PROP_FPS, 30)  # Set FPS to 30
-        cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)  # Lower resolution for faster processing
-        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-        
         # Get frame dimensions
         frame_width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
         frame_height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
@@ -159,121 +196,119 @@ def main():
         
         # Enhanced smoothing variables for ultra-smooth cursor movement
         prev_screen_x, prev_screen_y = screen_width // 2, screen_height // 2
-        smoothing_factor = 0.75  # Much higher for smoother, continuous motion
+        # EMA with smoothing factor 0.75, in integer arithmetic:
+        # smooth = (prev * 3 + new) >> 2
         
-        # Velocity tracking for predictive smoothing
-        velocity_x, velocity_y = 0, 0
-        velocity_factor = 0.3  # Smoothing for velocity
+        # Between full MediaPipe runs the index tip is carried forward with
+        # Lucas-Kanade optical flow on that single point
+        INFER_EVERY = 3
+        prev_gray = None
+        track_pt = None
+        hud = None
+        
+        # Capture and MediaPipe inference run on background threads; this
+        # loop handles cursor logic, clicks and display only.
+        pipeline = HandPipeline(cap, hands, infer_every=INFER_EVERY).start()
         
         while True:
-            ret, frame = cap.read()
+            item = pipeline.read()
             
-            if not ret:
+            if item is None:
                 print("Error: Failed to read frame")
                 break
             
-            # Flip frame for selfie view
-            frame = cv2.flip(frame, 1)
+            # Frame arrives already flipped for selfie view
+            frame, results, now = item
             h, w, c = frame.shape
             
-            # Convert to RGB for MediaPipe
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            results = hands.process(rgb_frame)
-            
             cursor_x, cursor_y = None, None
             is_pinching = False
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
             
-            # Draw hand landmarks and detect gestures
-            if results.multi_hand_landmarks:
-                for hand_landmarks in results.multi_hand_landmarks:
+            # Index tip position from inference or from optical flow
+            position = None
+            hand_landmarks = None
+            
+            if results is not None:
+                if results.hand_landmarks:
+                    hand_landmarks = results.hand_landmarks[0]
+                    
+                    # Draw hand landmarks
+                    draw_hand(frame, hand_landmarks, color=(200, 100, 0))
+                    
+                    # Get index finger position
+                    position = get_index_finger_position(hand_landmarks, w, h)
+                    tip = hand_landmarks[8]
+                    track_pt = np.array([[[tip.x * w, tip.y * h]]], dtype=np.float32)
+                else:
+                    # Reset pinch state if hand not detected
+                    pinch_detected_last = False
+                    track_pt = None
+            elif track_pt is not None and prev_gray is not None:
+                # Inference skipped this frame: advance the last index tip
+                next_pt, status, _ = cv2.calcOpticalFlowPyrLK(
+                    prev_gray, gray, track_pt, None, winSize=(21, 21), maxLevel=2
+                )
+                if status[0][0]:
+                    track_pt = next_pt
+                    px, py = next_pt[0][0]
+                    position = map_to_screen(px / w, py / h, w, h)
+                else:
+                    track_pt = None
+            prev_gray = gray
+            
+            if position is not None:
+                try:
+                    screen_x, screen_y, frame_x, frame_y = position
+                    
+                    # Apply exponential moving average smoothing (EMA)
+                    smooth_screen_x = (prev_screen_x * 3 + screen_x) >> 2
+                    smooth_screen_y = (prev_screen_y * 3 + screen_y) >> 2
+                    
+                    # Update previous position
+                    prev_screen_x = smooth_screen_x
+                    prev_screen_y = smooth_screen_y
+                    
+                    cursor_x, cursor_y = frame_x, frame_y
+                    
+                    # Move mouse to index finger position (with error handling)
                     try:
-                        # Draw hand landmarks
-                        mp_drawing.draw_landmarks(
-                            frame,
-                            hand_landmarks,
-                            mp_hands.HAND_CONNECTIONS,
-                            mp_drawing.DrawingSpec(color=(200, 100, 0), thickness=1, circle_radius=1),
-                            mp_drawing.DrawingSpec(color=(200, 100, 0), thickness=1)
-                        )
-                        
-                        # Get index finger position
-                        screen_x, screen_y, frame_x, frame_y = get_index_finger_position(hand_landmarks, w, h)
-                        
-                        # Calculate velocity (for smoother motion)
-                        vel_x = screen_x - prev_screen_x
-                        vel_y = screen_y - prev_screen_y
-                        
-                        # Smooth the velocity
-                        velocity_x = velocity_x * velocity_factor + vel_x * (1 - velocity_factor)
-                        velocity_y = velocity_y * velocity_factor + vel_y * (1 - velocity_factor)
-                        
-                        # Apply exponential moving average smoothing (EMA)
-                        smooth_screen_x = int(prev_screen_x * smoothing_factor + screen_x * (1 - smoothing_factor))
-                        smooth_screen_y = int(prev_screen_y * smoothing_factor + screen_y * (1 - smoothing_factor))
-                        
-                        # Update previous position
-                        prev_screen_x = smooth_screen_x
-                        prev_screen_y = smooth_screen_y
-                        
-                        cursor_x, cursor_y = frame_x, frame_y
-                        
-                        # Move mouse to index finger position (with error handling)
-                        try:
-                            pyautogui.moveTo(smooth_screen_x, smooth_screen_y, duration=0)
-                        except Exception as e:
-                            pass  # Silently handle mouse positioning errors
-                        
+                        move_cursor(smooth_screen_x, smooth_screen_y)
+                    except Exception as e:
+                        pass  # Silently handle mouse positioning errors
+                    
+                    if hand_landmarks is None:
+                        # Pinch is only evaluated on full-inference frames
+                        is_pinching = pinch_detected_last
+                    else:
                         # Check if pinch is detected
                         is_pinching = is_pinch_detected(hand_landmarks)
                         
                         # Only click once per pinch (transition detection)
                         if is_pinching and not pinch_detected_last:
-                            current_time = time.time()
-                            
                             # Check cooldown before performing click
-                            if click_cooldown_time is None or (current_time - click_cooldown_time) > click_cooldown_duration:
+                            if click_cooldown_time is None or (now - click_cooldown_time) > click_cooldown_duration:
                                 try:
                                     pyautogui.click()
-                                    click_cooldown_time = current_time
+                                    click_cooldown_time = now
                                     print(f"✓ LEFT CLICK performed at ({smooth_screen_x}, {smooth_screen_y})")
                                 except Exception as e:
                                     pass  # Silently handle click errors
                         
                         # Update pinch state
                         pinch_detected_last = is_pinching
-                    
-                    except Exception as e:
-                        print(f"Error processing hand landmarks: {e}")
-                        continue
-            else:
-                # Reset pinch state if hand not detected
-                pinch_detected_last = False
+                
+                except Exception as e:
+                    print(f"Error processing hand landmarks: {e}")
             
             # Draw cursor on frame
             if cursor_x is not None and cursor_y is not None:
                 draw_cursor(frame, cursor_x, cursor_y, is_pinching)
             
-            # Display screen position info
-            cv2.putText(
-                frame,
-                f"Screen: {screen_width}x{screen_height}",
-                (10, 30),
-                cv2.FONT_HERSHEY_SIMPLEX,
-                0.6,
-                (255, 255, 255),
-                2
-            )
-            
-            # Display smoothing info
-            cv2.putText(
-                frame,
-                "Ultra Smooth EMA Tracking: ACTIVE",
-                (10, 60),
-                cv2.FONT_HERSHEY_SIMPLEX,
-                0.5,
-                (0, 255, 100),
-                1
-            )
+            # Static guidance text and corner marks, rasterized once
+            if hud is None or not hud.fits(frame):
+                hud = StaticOverlay(h, w, draw_static_hud)
+            hud.apply(frame)
             
             # Display current mode
             mode_text = "MODE: PINCHING" if is_pinching else "MODE: TRACKING"
@@ -288,48 +323,25 @@ def main():
                 2
             )
             
-            # Draw screen area guide (corners)
-            corner_size = 20
-            cv2.line(frame, (0, 0), (corner_size, 0), (100, 100, 100), 2)  # Top-left
-            cv2.line(frame, (0, 0), (0, corner_size), (100, 100, 100), 2)
-            cv2.line(frame, (w-1, 0), (w-1-corner_size, 0), (100, 100, 100), 2)  # Top-right
-            cv2.line(frame, (w-1, 0), (w-1, corner_size), (100, 100, 100), 2)
-            cv2.line(frame, (0, h-1), (corner_size, h-1), (100, 100, 100), 2)  # Bottom-left
-            cv2.line(frame, (0, h-1), (0, h-1-corner_size), (100, 100, 100), 2)
-            cv2.line(frame, (w-1, h-1), (w-1-corner_size, h-1), (100, 100, 100), 2)  # Bottom-right
-            cv2.line(frame, (w-1, h-1), (w-1, h-1-corner_size), (100, 100, 100), 2)
-            
-            # Instructions
-            cv2.putText(
-                frame,
-                "Press 'q' to quit",
-                (10, h - 20),
-                cv2.FONT_HERSHEY_SIMPLEX,
-                0.6,
-                (200, 200, 200),
-                2
-            )
-            
-            # Show frame
-            cv2.imshow("Gesture Mouse Control - Index Finger Cursor & Pinch to Click", frame)
-            
-            # Check for quit key
-            key = cv2.waitKey(1) & 0xFF
-            if key == ord('q'):
+            # Show frame and check for quit key (Ctrl+C when headless)
+            if show_frame("Gesture Mouse Control - Index Finger Cursor & Pinch to Click", frame, ord('q')):
                 print("\nProgram stopped by user")
                 break
         
+        pipeline.stop()
         cap.release()
         cv2.destroyAllWindows()
-        hands.close()
+        release(hands)
         print("Program closed successfully")
     
     except Exception as e:
         print(f"Fatal error: {e}")
         try:
+            if pipeline is not None:
+                pipeline.stop()
             cap.release()
             cv2.destroyAllWindows()
-            hands.close()
+            release(hands)
         except:
             pass
 
@@ -1,14 +1,21 @@
 import cv2
-import mediapipe as mp
+import numpy as np
 import pyautogui
-from PIL import Image, ImageDraw, ImageFont
 from datetime import datetime
-import time
 import os
+import queue
+import threading
+import time
+
+from frame_pipeline import INFER_SIZE, CaptureThread, open_camera
+from gesture_kernels import PIP_IDS, TIP_IDS, landmarks_to_array
+from hand_detector_pool import get_hands, release
+from overlay import HeaderBar, draw_hand, show_frame
 
-# Initialize MediaPipe Hand Detection
-mp_hands = mp.solutions.hands
-mp_drawing = mp.solutions.drawing_utils
+try:
+    import mss
+except Exception:
+    mss = None
 
 # Create screenshots folder if it doesn't exist
 screenshot_folder = "screenshots"
@@ -16,119 +23,174 @@ if not os.path.exists(screenshot_folder):
     os.makedirs(screenshot_folder)
 
 
-def are_fingers_up(hand_landmarks):
+SCREENSHOT_PATTERN = (False, True, False, False, False)
+EXIT_PATTERN = (True, True, False, False, True)
+
+
+def fingers_up(hand_landmarks):
     """
-    Screenshot trigger: Index finger only up, all others down.
+    [thumb, index, middle, ring, pinky] as a tuple of bools.
+    `hand_landmarks` is one Tasks `hand_landmarks[i]` list.
+    Thumb compares x with its IP joint; other fingers compare tip y with PIP.
     """
-    tips = [4, 8, 12, 16, 20]
-    lm = hand_landmarks.landmark
+    pts = landmarks_to_array(hand_landmarks)
+    fingers = np.empty(5, dtype=bool)
+    fingers[0] = pts[4, 0] < pts[3, 0]
+    fingers[1:] = pts[TIP_IDS, 1] < pts[PIP_IDS, 1]
+    return tuple(fingers.tolist())
 
-    fingers = []
-    # Thumb: compare x
-    fingers.append(lm[tips[0]].x < lm[tips[0] - 1].x)
-    # Other fingers: tip above PIP
-    for i in range(1, 5):
-        fingers.append(lm[tips[i]].y < lm[tips[i] - 2].y)
 
-    # Index only: [F, T, F, F, F]
-    return fingers == [False, True, False, False, False]
+def are_fingers_up(fingers):
+    """
+    Screenshot trigger: Index finger only up, all others down.
+    """
+    return fingers == SCREENSHOT_PATTERN
 
 
-def is_exit_gesture(hand_landmarks):
+def is_exit_gesture(fingers):
     """
     Exit-to-master gesture: Thumb + Index + Pinky up, Middle + Ring down.
     [thumb=T, index=T, middle=F, ring=F, pinky=T]
     """
-    lm = hand_landmarks.landmark
+    return fingers == EXIT_PATTERN
 
-    tips = [4, 8, 12, 16, 20]
-    fingers = []
 
-    # Thumb: compare x positions
-    fingers.append(lm[tips[0]].x < lm[tips[0] - 1].x)
+def draw_header(img):
+    """Screenshot-mode banner with the gesture guide."""
+    w = img.shape[1]
+    cv2.rectangle(img, (0, 0), (w, 70), (20, 20, 50), -1)
+    cv2.putText(img, "SCREENSHOT MODE", (15, 35),
+                cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
+    cv2.putText(img, "Index Only (3s): Snap | T+I+Pinky (2s): Exit | ESC: Quit",
+                (15, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.45, (255, 255, 255), 1)
 
-    # Other fingers: tip above PIP
-    for i in range(1, 5):
-        fingers.append(lm[tips[i]].y < lm[tips[i] - 2].y)
 
-    thumb, index, middle, ring, pinky = fingers
-    return thumb and index and not middle and not ring and pinky
+# "png" (lossless, fast zlib level) or "jpg" (quality 92, smaller and
+# quicker still). The encode time decides how fast the save queue drains.
+SCREENSHOT_FORMAT = "png"
+_ENCODE_PARAMS = {
+    "png": [cv2.IMWRITE_PNG_COMPRESSION, 1],
+    "jpg": [cv2.IMWRITE_JPEG_QUALITY, 92, cv2.IMWRITE_JPEG_OPTIMIZE, 0],
+}
 
+# Screenshots are annotated, encoded and written on a background thread so
+# the camera loop only pays for the grab itself
+_save_queue = queue.Queue(maxsize=8)
+_save_thread = None
 
-def take_professional_screenshot():
-    """Take a screenshot and add professional timestamp/watermark."""
-    try:
-        timestamp = datetime.now()
-        screenshot = pyautogui.screenshot()
+# MSS screen grabber, created on first use by the thread that grabs
+_sct = None
 
-        img = screenshot.convert('RGB')
-        draw = ImageDraw.Draw(img)
 
-        timestamp_str = timestamp.strftime("%Y-%m-%d %H:%M:%S")
+def _grab_screen():
+    """Grab the primary monitor.
 
-        try:
-            font = ImageFont.truetype("arial.ttf", 20)
-        except:
-            font = ImageFont.load_default()
-
-        text_bbox = draw.textbbox((0, 0), timestamp_str, font=font)
-        text_width  = text_bbox[2] - text_bbox[0]
-        text_height = text_bbox[3] - text_bbox[1]
-
-        padding = 10
-        img_width, img_height = img.size
-
-        x_pos = img_width  - text_width  - (padding * 2) - 10
-        y_pos = img_height - text_height - (padding * 2) - 10
-
-        draw.rectangle(
-            [x_pos, y_pos, img_width - 10, img_height - 10],
-            fill=(0, 0, 0),
-            outline=(200, 200, 200)
-        )
-        draw.text(
-            (x_pos + padding, y_pos + padding),
-            timestamp_str, font=font, fill=(255, 255, 255)
-        )
+    With MSS this is a raw BGRA `ScreenShot` copied straight out of the
+    framebuffer; any conversion is left to the save worker.  Falls back
+    to `pyautogui.screenshot()` when MSS is not installed.
+    """
+    global _sct
+    if mss is None:
+        return pyautogui.screenshot()
+    if _sct is None:
+        _sct = mss.mss()
+    return _sct.grab(_sct.monitors[1])
+
+
+def _annotate_and_save(screenshot, timestamp):
+    """Add the timestamp box and watermark, then write the PNG."""
+    if hasattr(screenshot, 'bgra'):
+        # MSS shot: raw BGRA rows straight from the framebuffer
+        raw = np.frombuffer(screenshot.bgra, dtype=np.uint8)
+        img = cv2.cvtColor(raw.reshape(screenshot.height, screenshot.width, 4),
+                           cv2.COLOR_BGRA2BGR)
+    else:
+        # pyautogui fallback returns a PIL image in RGB order
+        img = cv2.cvtColor(np.asarray(screenshot.convert('RGB')), cv2.COLOR_RGB2BGR)
+
+    timestamp_str = timestamp.strftime("%Y-%m-%d %H:%M:%S")
+
+    font = cv2.FONT_HERSHEY_SIMPLEX
+    (text_width, text_height), baseline = cv2.getTextSize(timestamp_str, font, 0.7, 2)
+
+    padding = 10
+    img_height, img_width = img.shape[:2]
+
+    x_pos = img_width  - text_width  - (padding * 2) - 10
+    y_pos = img_height - text_height - baseline - (padding * 2) - 10
+
+    cv2.rectangle(img, (x_pos, y_pos), (img_width - 10, img_height - 10), (0, 0, 0), -1)
+    cv2.rectangle(img, (x_pos, y_pos), (img_width - 10, img_height - 10), (200, 200, 200), 1)
+    cv2.putText(img, timestamp_str, (x_pos + padding, y_pos + padding + text_height),
+                font, 0.7, (255, 255, 255), 2, cv2.LINE_AA)
+
+    cv2.putText(img, "Gesture Screenshot", (10, 25), font, 0.5, (100, 100, 100), 1, cv2.LINE_AA)
 
+    filename = timestamp.strftime(f"%Y%m%d_%H%M%S_screenshot.{SCREENSHOT_FORMAT}")
+    filepath = os.path.join(screenshot_folder, filename)
+    cv2.imwrite(filepath, img, _ENCODE_PARAMS[SCREENSHOT_FORMAT])
+
+    print(f"✓ Screenshot saved: {filepath}")
+
+
+def _save_worker():
+    while True:
+        screenshot, timestamp = _save_queue.get()
         try:
-            wm_font = ImageFont.truetype("arial.ttf", 14)
-        except:
-            wm_font = ImageFont.load_default()
+            _annotate_and_save(screenshot, timestamp)
+        except Exception as e:
+            print(f"Error saving screenshot: {e}")
+        finally:
+            _save_queue.task_done()
 
-        draw.text((10, 10), "Gesture Screenshot", font=wm_font, fill=(100, 100, 100))
 
-        filename = timestamp.strftime("%Y%m%d_%H%M%S_screenshot.png")
-        filepath = os.path.join(screenshot_folder, filename)
-        img.save(filepath)
+def take_professional_screenshot():
+    """Grab the screen and queue it for timestamping/watermarking and saving."""
+    global _save_thread
+    try:
+        if _save_thread is None:
+            _save_thread = threading.Thread(target=_save_worker, daemon=True)
+            _save_thread.start()
 
-        print(f"✓ Screenshot saved: {filepath}")
+        _save_queue.put_nowait((_grab_screen(), datetime.now()))
         return True
 
+    except queue.Full:
+        print("Error taking screenshot: save queue is full")
+        return False
     except Exception as e:
         print(f"Error taking screenshot: {e}")
         return False
 
 
-def run_screenshot():
-    """Run the gesture screenshot mode — callable from master controller."""
+def flush_screenshots():
+    """Block until every queued screenshot has been written."""
+    _save_queue.join()
+
+
+def run_screenshot(hands=None, cap=None):
+    """Run the gesture screenshot mode — callable from master controller.
+
+    `hands` is a detector shared by the caller; by default a pooled one is
+    used, so entering the mode again does not reload the model.  Likewise a
+    `cap` passed in is reused and left open on exit.
+    """
     print("\n========== SCREENSHOT MODE ACTIVE ==========")
     print("  ☝️  Index finger only       → TAKE SCREENSHOT (hold 3s)")
     print("  🤙  Thumb + Index + Pinky   → EXIT to Master  (hold 2s)")
     print("  Press ESC to EXIT")
     print("=============================================\n")
 
-    hands = mp_hands.Hands(
-        static_image_mode=False,
-        max_num_hands=1,
-        min_detection_confidence=0.7,
-        min_tracking_confidence=0.5
-    )
-    cap = cv2.VideoCapture(0)
+    if hands is None:
+        hands = get_hands(max_hands=1, det=0.7, track=0.5)
+    # A camera passed in by the caller stays open for it after the mode exits
+    own_cap = cap is None
+    if own_cap:
+        cap = open_camera()
 
     if not cap.isOpened():
         print("Error: Could not open camera")
-        hands.close()
+        release(hands)
         return
 
     gesture_countdown_start = None
@@ -139,38 +201,64 @@ def run_screenshot():
     COUNTDOWN_DURATION = 3.0   # seconds before snap
     EXIT_HOLD          = 2.0   # seconds to hold exit gesture
 
+    # MediaPipe gets a downscaled copy; normalized landmarks still line up
+    # with the full-size frame used for display
+    infer_w, infer_h = INFER_SIZE
+    small_buf = np.empty((infer_h, infer_w, 3), dtype=np.uint8)
+    rgb_buf = np.empty((infer_h, infer_w, 3), dtype=np.uint8)
+
+    # Gestures are held for seconds, so MediaPipe runs on every other frame
+    # and the last result is reused in between
+    INFER_EVERY = 2
+    frame_idx   = 0
+    results     = None
+    header      = None
+
+    # Camera reads run on a grabber thread so they overlap with inference
+    capture = CaptureThread(cap)
+    capture.start()
+
     while True:
-        ret, frame = cap.read()
-        if not ret:
+        item = capture.read()
+        if item is None:
             print("Error: Failed to read frame")
             break
+        frame, _ = item
+
+        # Single monotonic clock read per frame; every countdown and cooldown
+        # below is measured against it (immune to wall-clock adjustments)
+        current_time = time.monotonic()
 
         frame = cv2.flip(frame, 1)
         h, w, _ = frame.shape
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        results = hands.process(rgb_frame)
-
-        current_time = time.time()
-
-        # Header bar
-        cv2.rectangle(frame, (0, 0), (w, 70), (20, 20, 50), -1)
-        cv2.putText(frame, "SCREENSHOT MODE", (15, 35),
-                    cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
-        cv2.putText(frame, "Index Only (3s): Snap | T+I+Pinky (2s): Exit | ESC: Quit",
-                    (15, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.45, (255, 255, 255), 1)
-
-        if results.multi_hand_landmarks:
-            hand_landmarks = results.multi_hand_landmarks[0]
+        frame_idx += 1
+        if results is None or frame_idx % INFER_EVERY == 0:
+            cv2.resize(frame, INFER_SIZE, dst=small_buf, interpolation=cv2.INTER_AREA)
+            # Writable only while being filled, so nothing else can modify the
+            # buffer while it is being handed over (mp.Image copies the data)
+            rgb_buf.flags.writeable = True
+            cv2.cvtColor(small_buf, cv2.COLOR_BGR2RGB, dst=rgb_buf)
+            rgb_buf.flags.writeable = False
+            results = hands.process(rgb_buf)
+
+        # Header bar (static, rasterized once)
+        if header is None or not header.fits(frame):
+            header = HeaderBar(70, w, draw_header)
+        header.apply(frame)
+
+        # Tasks-native landmark lists: no NormalizedLandmarkList protos are
+        # built just to be read back
+        if results.hand_landmarks:
+            hand_landmarks = results.hand_landmarks[0]
 
             # Draw landmarks
-            mp_drawing.draw_landmarks(
-                frame, hand_landmarks, mp_hands.HAND_CONNECTIONS,
-                mp_drawing.DrawingSpec(color=(0, 255, 0), thickness=2, circle_radius=2),
-                mp_drawing.DrawingSpec(color=(255, 0, 0), thickness=2)
-            )
+            draw_hand(frame, hand_landmarks, color=(255, 0, 0), thickness=2)
+
+            # Finger state is read once and shared by both gesture checks
+            fingers = fingers_up(hand_landmarks)
 
             # --- Exit-to-master gesture check (thumb + index + pinky, hold 2s) ---
-            if is_exit_gesture(hand_landmarks):
+            if is_exit_gesture(fingers):
                 if exit_start is None:
                     exit_start = current_time
                 held = current_time - exit_start
@@ -184,7 +272,7 @@ def run_screenshot():
                 exit_start = None
 
             # --- Screenshot trigger gesture ---
-            if are_fingers_up(hand_landmarks):
+            if are_fingers_up(fingers):
                 if gesture_countdown_start is None:
                     gesture_countdown_start = current_time
                     print("Gesture detected! Countdown started...")
@@ -214,14 +302,15 @@ def run_screenshot():
             cv2.putText(frame, "No hand detected", (15, h - 40),
                         cv2.FONT_HERSHEY_SIMPLEX, 0.6, (150, 150, 150), 1)
 
-        cv2.imshow("Gesture Screenshot", frame)
-
-        if cv2.waitKey(1) & 0xFF == 27:  # ESC
+        if show_frame("Gesture Screenshot", frame, 27):  # ESC
             break
 
-    cap.release()
+    capture.stop()
+    if own_cap:
+        cap.release()
     cv2.destroyAllWindows()
-    hands.close()
+    release(hands)
+    flush_screenshots()
     print("Exiting Screenshot Mode...")
 
 
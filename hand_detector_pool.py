@@ -0,0 +1,48 @@
+"""hand_detector_pool.py
+Process-wide cache of hand detectors, shared across mode switches.
+
+Building a HandLandmarker loads the TFLite models and initialises the
+XNNPACK/GPU delegate, which costs a few hundred milliseconds.  When the
+master controller hops between modes, each mode used to pay that again.
+`get_hands` hands out one resident detector per settings tuple instead;
+modes `release` it when they exit rather than closing it, and everything is
+closed once at interpreter exit.
+"""
+
+import atexit
+
+_pool = {}
+
+
+def get_hands(max_hands=1, det=0.7, track=0.7, running_mode="video", use_gpu=True):
+    """Return the shared HandTracker for these settings, creating it on first use."""
+    key = (max_hands, det, track, running_mode, use_gpu)
+    hands = _pool.get(key)
+    if hands is None:
+        # Imported lazily so merely importing the pool does not load MediaPipe
+        from hand_tracker import HandTracker
+        hands = HandTracker(
+            num_hands=max_hands,
+            min_detection_confidence=det,
+            min_tracking_confidence=track,
+            use_gpu=use_gpu,
+            running_mode=running_mode,
+        )
+        _pool[key] = hands
+    return hands
+
+
+def release(hands):
+    """Hand a detector back to the pool; it stays loaded for the next mode."""
+    # Nothing to free: the detector is reused as-is by the next get_hands()
+
+
+@atexit.register
+def close_all():
+    """Close every pooled detector."""
+    while _pool:
+        _, hands = _pool.popitem()
+        try:
+            hands.close()
+        except Exception:
+            pass
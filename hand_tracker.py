@@ -0,0 +1,134 @@
+"""hand_tracker.py
+MediaPipe Tasks `HandLandmarker` behind the `mp.solutions.hands` interface.
+
+`HandTracker.process(rgb)` can be dropped in wherever a legacy `Hands`
+object is used.  The Tasks backend skips the Solutions graph's Python-side
+packet wrapping, can run the palm-detector and landmark networks on the GPU
+delegate, and falls back to the CPU (XNNPACK) when no GPU delegate is
+available on the platform (e.g. Windows wheels).
+
+In "video" mode `process` blocks until the frame's landmarks are ready; use
+it when inference already runs on its own thread (see `frame_pipeline`).  In
+"live_stream" mode `process` submits the frame with `detect_async` and
+returns the newest result delivered so far, so a single-threaded loop can
+capture the next frame while MediaPipe works.
+
+Results expose the Tasks-native `hand_landmarks` (plain lists of landmarks)
+and, for code written against the Solutions API, a lazily built
+`multi_hand_landmarks` view made of `NormalizedLandmarkList` protos, so
+`mp.solutions.drawing_utils` keeps working.
+"""
+
+import threading
+import time
+from pathlib import Path
+
+import mediapipe as mp
+from mediapipe.framework.formats import landmark_pb2
+
+MODEL_PATH = Path(__file__).parent / 'hand_landmarker.task'
+
+BaseOptions = mp.tasks.BaseOptions
+HandLandmarker = mp.tasks.vision.HandLandmarker
+HandLandmarkerOptions = mp.tasks.vision.HandLandmarkerOptions
+VisionRunningMode = mp.tasks.vision.RunningMode
+
+
+class HandResult:
+    """Landmarks for one processed frame."""
+
+    __slots__ = ("hand_landmarks", "_multi")
+
+    def __init__(self, hand_landmarks=None):
+        self.hand_landmarks = hand_landmarks or []
+        self._multi = None
+
+    @property
+    def multi_hand_landmarks(self):
+        """Solutions-API view of the result (None when no hand was found)."""
+        if not self.hand_landmarks:
+            return None
+        if self._multi is None:
+            self._multi = []
+            for hand in self.hand_landmarks:
+                proto = landmark_pb2.NormalizedLandmarkList()
+                proto.landmark.extend(
+                    landmark_pb2.NormalizedLandmark(x=p.x, y=p.y, z=p.z) for p in hand
+                )
+                self._multi.append(proto)
+        return self._multi
+
+
+class HandTracker:
+    """Drop-in for `mp.solutions.hands.Hands` backed by a Tasks HandLandmarker."""
+
+    def __init__(self, num_hands=1, min_detection_confidence=0.5,
+                 min_tracking_confidence=0.5, use_gpu=True,
+                 running_mode="video", model_path=MODEL_PATH):
+        self._last_ts = -1
+        self._live = running_mode == "live_stream"
+        self._lock = threading.Lock()
+        self.latest_result = HandResult()
+
+        def build(delegate):
+            if self._live:
+                extra = dict(running_mode=VisionRunningMode.LIVE_STREAM,
+                             result_callback=self._on_result)
+            else:
+                extra = dict(running_mode=VisionRunningMode.VIDEO)
+            options = HandLandmarkerOptions(
+                base_options=BaseOptions(model_asset_path=str(model_path),
+                                         delegate=delegate),
+                num_hands=num_hands,
+                min_hand_detection_confidence=min_detection_confidence,
+                min_hand_presence_confidence=min_detection_confidence,
+                min_tracking_confidence=min_tracking_confidence,
+                **extra,
+            )
+            return HandLandmarker.create_from_options(options)
+
+        self.detector = None
+        if use_gpu:
+            try:
+                self.detector = build(BaseOptions.Delegate.GPU)
+                print("[HandTracker] Using GPU delegate")
+            except Exception as e:
+                print(f"[HandTracker] GPU delegate unavailable ({e}); using CPU")
+        if self.detector is None:
+            self.detector = build(BaseOptions.Delegate.CPU)
+
+    def _on_result(self, result, output_image, timestamp_ms):
+        with self._lock:
+            self.latest_result = HandResult(result.hand_landmarks)
+
+    def _timestamp_ms(self, now):
+        # Tasks video/stream modes require strictly increasing timestamps
+        ts = max(int(now * 1000), self._last_ts + 1)
+        self._last_ts = ts
+        return ts
+
+    def process(self, rgb, now=None):
+        """Run the landmarker on an RGB uint8 frame and return a HandResult.
+
+        `now` is the frame's `time.monotonic()` stamp, if the caller already
+        has one.  In live_stream mode the returned result may belong to an
+        earlier frame.
+        """
+        if now is None:
+            now = time.monotonic()
+        image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb)
+        if self._live:
+            self.detector.detect_async(image, self._timestamp_ms(now))
+            with self._lock:
+                return self.latest_result
+        result = self.detector.detect_for_video(image, self._timestamp_ms(now))
+        return HandResult(result.hand_landmarks)
+
+    def close(self):
+        self.detector.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -1,15 +1,20 @@
 # Master Gesture Controller
 # Main file to manage different gesture modes
 import cv2
-import mediapipe as mp
 import pyautogui
+import sys
 import time
 import numpy as np
+from collections import deque
 from pathlib import Path
 
 # Import mode classes and functions
 from open_files import HandFileOpener
 from app_controller import zoom_in, zoom_out
+from frame_pipeline import HandPipeline, open_camera
+from gesture_kernels import code_to_fingers, finger_code, landmarks_to_array, span_finger_code
+from hand_detector_pool import get_hands
+from overlay import SHOW_UI, HeaderBar, TextCache, debug_enabled, draw_hand, show_frame
 from scroll import run_scroll
 from Zoom import run_zoom
 from slidetravel import run_slide_travel
@@ -18,38 +23,51 @@ from video_player import run_video_player
 from app_control import run_app_control
 from volume_control import run_volume_control
 
-mp_hands = mp.solutions.hands
-mp_drawing = mp.solutions.drawing_utils
-
 # ==================== UTILITY FUNCTIONS ====================
 
+# Improved thumb detection - higher threshold reduces false positives:
+# the thumb is extended if its tip is well away from the thumb MCP.
+# Other fingers are extended if the tip is significantly above the PIP joint
+THUMB_SPAN = 0.06
+TIP_MARGIN = 0.02
+
+# Exact finger pattern -> mode, keyed on the 5-bit finger code
+# (thumb<<4)|(index<<3)|(middle<<2)|(ring<<1)|pinky
+MODE_TABLE = {
+    0b11111: "scroll_mode",       # All fingers up
+    0b11000: "file_mode",         # Thumb + Index
+    0b00111: "ss_mode",           # Middle + Ring + Pinky
+    0b01100: "slide_mode",        # Index + Middle
+    0b01110: "video_mode",        # Index + Middle + Ring
+    0b01000: "zoom_mode",         # Index only
+    0b10001: "app_switch_mode",   # Thumb + Pinky (shaka)
+    0b01001: "volume_mode",       # Index + Pinky
+}
+
+# Flattened to a 32-entry list so the per-frame lookup is a plain index
+MODE_LUT = [MODE_TABLE.get(code) for code in range(32)]
+
+# Compile (or load the cached build of) the finger kernel now rather than
+# stalling the first frame with a hand in view
+span_finger_code(np.zeros((21, 2), dtype=np.float32), THUMB_SPAN, TIP_MARGIN)
+
+
+def hand_finger_code(hand):
+    """5-bit finger code (thumb<<4 ... pinky) for one hand's landmarks.
+
+    `hand` is one Tasks `hand_landmarks[i]` list (or a Solutions
+    `hand.landmark`).  The landmarks are copied into an array once and the
+    finger tests run as a single compiled kernel.
+    """
+    return span_finger_code(landmarks_to_array(hand), THUMB_SPAN, TIP_MARGIN)
+
+
 def fingers_up(hand, h, w):
     """
     Detect which fingers are up based on hand landmarks.
-    Returns: [thumb, index, middle, ring, pinky] as boolean list
+    Returns: [thumb, index, middle, ring, pinky] as a boolean ndarray
     """
-    lm = hand.landmark
-    
-    # Improved thumb detection - higher threshold reduces false positives
-    thumb_tip = lm[4]
-    thumb_pip = lm[2]
-    # Thumb is extended if the horizontal offset from thumb PIP is significant
-    thumb_extended = abs(thumb_tip.x - thumb_pip.x) > 0.06
-    fingers = [thumb_extended]
-    
-    # Other fingers - check if tip is above PIP joint (extended)
-    # Finger is up if tip.y < pip.y (tip is higher in frame)
-    tip_ids = [8, 12, 16, 20]    # Index, Middle, Ring, Pinky tips
-    pip_ids = [6, 10, 14, 18]    # Index, Middle, Ring, Pinky PIP joints
-    
-    for tip_id, pip_id in zip(tip_ids, pip_ids):
-        tip = lm[tip_id]
-        pip = lm[pip_id]
-        # Finger is extended if tip is significantly above PIP
-        is_extended = tip.y < (pip.y - 0.02)
-        fingers.append(is_extended)
-    
-    return fingers
+    return code_to_fingers(hand_finger_code(hand))
 
 
 def detect_mode_gesture(fingers):
@@ -57,44 +75,21 @@ def detect_mode_gesture(fingers):
     Detect gesture to enter a specific mode from detection mode.
     Returns the mode name or None.
     """
-    thumb, index, middle, ring, pinky = fingers
-    
-    # Check in order from most specific to least specific
-    
-    # All fingers up = Scroll Mode (MOST SPECIFIC)
-    if thumb and index and middle and ring and pinky:
-        return "scroll_mode"
-    
-    # Thumb + Index up, others down = File Opening Mode
-    if thumb and index and not middle and not ring and not pinky:
-        return "file_mode"
-    
-    # Middle + Ring + Pinky up (no thumb/index) = Screenshot Mode
-    if not thumb and not index and middle and ring and pinky:
-        return "ss_mode"
-    
-    # Index + Middle fingers up (no thumb/ring/pinky) = Slide Travel Mode
-    if not thumb and index and middle and not ring and not pinky:
-        return "slide_mode"
-    
-    # Index + Middle + Ring up, no thumb, no pinky = Video Player Mode
-    # (distinct from scroll=all5, slide=I+M, ss=M+R+P, zoom=I only)
-    if not thumb and index and middle and ring and not pinky:
-        return "video_mode"
-    
-    # Index only up, others down = Zoom Mode (LEAST SPECIFIC)
-    if not thumb and index and not middle and not ring and not pinky:
-        return "zoom_mode"
-    
-    # Thumb + Pinky up, others down = App Switch Mode (shaka/hang-loose)
-    if thumb and not index and not middle and not ring and pinky:
-        return "app_switch_mode"
+    # Every mode is an exact finger pattern, so one integer lookup replaces
+    # the chain of comparisons
+    return MODE_LUT[finger_code(fingers)]
 
-    # Index + Pinky up, no thumb/middle/ring = Volume Control Mode
-    if not thumb and index and not middle and not ring and pinky:
-        return "volume_mode"
 
-    return None
+def draw_master_header(img):
+    """Detection-mode banner with the gesture guide."""
+    w = img.shape[1]
+    cv2.rectangle(img, (0, 0), (w, 115), (20, 20, 50), -1)
+    cv2.putText(img, "MASTER CONTROLLER  -  Perform Gesture to Enter Mode",
+               (15, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.72, (0, 255, 0), 2)
+    cv2.putText(img, "T+I:File | All5:Scroll | Idx:Zoom | I+M:Slide | M+R+P:Screenshot",
+               (15, 65), cv2.FONT_HERSHEY_SIMPLEX, 0.50, (200, 220, 255), 1)
+    cv2.putText(img, "I+M+R:Video | T+Pinky:AppSwitch | I+Pinky:Volume",
+               (15, 90), cv2.FONT_HERSHEY_SIMPLEX, 0.50, (200, 220, 255), 1)
 
 
 def is_fist(fingers):
@@ -104,6 +99,85 @@ def is_fist(fingers):
 
 # ==================== SLIDESHOW AUTO-START HELPER ====================
 
+PPT_KEYWORDS = ('powerpoint', '.pptx', '.ppt')
+
+if sys.platform == "win32":
+    try:
+        import ctypes
+        from ctypes import wintypes
+        _user32 = ctypes.windll.user32
+        _EnumWindowsProc = ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.HWND, wintypes.LPARAM)
+    except Exception:
+        _user32 = None
+else:
+    _user32 = None
+
+# Last PowerPoint window found, reused while it still exists
+_ppt_hwnd = None
+
+
+def _window_title(hwnd):
+    length = _user32.GetWindowTextLengthW(hwnd)
+    if not length:
+        return ""
+    buf = ctypes.create_unicode_buffer(length + 1)
+    _user32.GetWindowTextW(hwnd, buf, length + 1)
+    return buf.value
+
+
+def _find_ppt_window():
+    """Return (hwnd, title) of a visible PowerPoint window, or None.
+
+    Enumeration stops at the first match instead of listing every
+    top-level window, and a previously found window is reused as long as
+    it is still open.
+    """
+    global _ppt_hwnd
+    if _ppt_hwnd and _user32.IsWindow(_ppt_hwnd):
+        return _ppt_hwnd, _window_title(_ppt_hwnd)
+
+    found = []
+
+    def _cb(hwnd, _):
+        if _user32.IsWindowVisible(hwnd):
+            title = _window_title(hwnd)
+            if title and any(k in title.lower() for k in PPT_KEYWORDS):
+                found.append((hwnd, title))
+                return False  # stop enumerating
+        return True
+
+    _user32.EnumWindows(_EnumWindowsProc(_cb), 0)
+    if not found:
+        _ppt_hwnd = None
+        return None
+    _ppt_hwnd = found[0][0]
+    return found[0]
+
+
+def _activate_ppt_window():
+    """Bring a PowerPoint window to the front; returns its title or None."""
+    if _user32 is not None:
+        match = _find_ppt_window()
+        if match is None:
+            return None
+        hwnd, title = match
+        _user32.ShowWindow(hwnd, 9)  # SW_RESTORE
+        _user32.SetForegroundWindow(hwnd)
+        return title
+
+    import pygetwindow as gw
+    ppt_wins = [w for w in gw.getAllWindows()
+                if any(k in w.title.lower() for k in PPT_KEYWORDS)]
+    if not ppt_wins:
+        return None
+    win = ppt_wins[0]
+    try:
+        win.activate()
+    except Exception:
+        pass
+    return win.title
+
+
 def start_ppt_slideshow(wait=1.5):
     """Focus an open PowerPoint window and press F5 to start slideshow.
     
@@ -111,19 +185,9 @@ def start_ppt_slideshow(wait=1.5):
     wait: seconds to wait after focusing before sending F5.
     """
     try:
-        import pygetwindow as gw
-        all_wins = gw.getAllWindows()
-        # Look for any window whose title contains 'PowerPoint'
-        ppt_wins = [w for w in all_wins
-                    if 'powerpoint' in w.title.lower() or '.pptx' in w.title.lower()
-                    or '.ppt' in w.title.lower()]
-        if ppt_wins:
-            win = ppt_wins[0]
-            print(f"  [SlideMode] Found PPT window: '{win.title}'")
-            try:
-                win.activate()
-            except Exception:
-                pass
+        title = _activate_ppt_window()
+        if title is not None:
+            print(f"  [SlideMode] Found PPT window: '{title}'")
             time.sleep(wait)          # give PowerPoint time to focus
             pyautogui.press('f5')     # F5 = Start Slideshow from beginning
             time.sleep(0.5)
@@ -176,17 +240,30 @@ class FileOpeningMode:
 
 class MasterGestureController:
     def __init__(self):
-        self.mp_hands = mp.solutions.hands
-        self.hands = self.mp_hands.Hands(
-            max_num_hands=1,
-            min_detection_confidence=0.7,
-            min_tracking_confidence=0.7
-        )
-        self.mp_draw = mp.solutions.drawing_utils
-        self.cap = cv2.VideoCapture(0)
+        # One detector for detection mode and every mode that accepts it, so
+        # mode switches skip the model load.  A lower tracking threshold
+        # keeps the landmark tracker carrying the hand between frames
+        # instead of re-running the palm detector
+        self.hands = get_hands(max_hands=1, det=0.7, track=0.5)
+        self.cap = open_camera()
+        # Mode gestures are held for many frames, so running MediaPipe on
+        # every other frame and reusing the last result in between is enough
+        self.INFER_EVERY = 2
+        self.last_result = None
+        self.header = None
+        # Capture + inference threads; the main loop only draws and decides
+        self.capture = None
+        # Detected/Fingers/Hold lines only take a few distinct values
+        self.text = TextCache()
+        # Built on the first file-mode entry, then reused
+        self.file_opener = None
         self.mode_confirmed = False
         self.confirmation_frames = 0
         self.CONFIRMATION_FRAMES = 10  # Frames to hold gesture to confirm mode entry
+        # Recent per-frame mode guesses; a mode is confirmed once it fills
+        # CONFIRMATION_FRAMES of the window, so a single jittery frame no
+        # longer restarts the hold
+        self.mode_history = deque(maxlen=12)
 
     def run(self):
         """Main loop - detection mode with gesture-based mode selection"""
@@ -210,74 +287,81 @@ class MasterGestureController:
         print("  ESC → Quit application")
         print("======================================================\n")
         
+        self._start_capture()
         while True:
             try:
-                success, frame = self.cap.read()
-                if not success:
+                item = self.capture.read()
+                if item is None:
                     break
-                
-                frame = cv2.flip(frame, 1)
+                # Mirroring, downscaling and inference already happened on
+                # the pipeline threads; skipped frames come with result=None
+                frame, result, _ = item
                 h, w, _ = frame.shape
-                rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                result = self.hands.process(rgb)
+                if result is not None:
+                    self.last_result = result
+                result = self.last_result
                 
-                cv2.rectangle(frame, (0, 0), (w, 115), (20, 20, 50), -1)
-                cv2.putText(frame, "MASTER CONTROLLER  -  Perform Gesture to Enter Mode",
-                           (15, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.72, (0, 255, 0), 2)
-                cv2.putText(frame, "T+I:File | All5:Scroll | Idx:Zoom | I+M:Slide | M+R+P:Screenshot",
-                           (15, 65), cv2.FONT_HERSHEY_SIMPLEX, 0.50, (200, 220, 255), 1)
-                cv2.putText(frame, "I+M+R:Video | T+Pinky:AppSwitch | I+Pinky:Volume",
-                           (15, 90), cv2.FONT_HERSHEY_SIMPLEX, 0.50, (200, 220, 255), 1)
+                # Everything drawn below is preview-only; headless runs
+                # only classify the hand
+                draw = SHOW_UI
                 
-                if result.multi_hand_landmarks:
-                    for hand_landmarks in result.multi_hand_landmarks:
-                        self.mp_draw.draw_landmarks(
-                            frame, hand_landmarks, self.mp_hands.HAND_CONNECTIONS
-                        )
+                # Static header is rasterized once and row-copied each frame
+                if draw:
+                    if self.header is None or not self.header.fits(frame):
+                        self.header = HeaderBar(115, w, draw_master_header)
+                    self.header.apply(frame)
+                
+                # Tasks-native landmark lists go straight into one array
+                # conversion; the proto-based multi_hand_landmarks view
+                # would only be copied again
+                if result is not None and result.hand_landmarks:
+                    for hand_landmarks in result.hand_landmarks:
+                        if draw:
+                            draw_hand(frame, hand_landmarks)
                         
-                        fingers = fingers_up(hand_landmarks, h, w)
-                        gesture_mode = detect_mode_gesture(fingers)
+                        code = hand_finger_code(hand_landmarks)
+                        gesture_mode = MODE_LUT[code]
                         
-                        # Debug output
-                        finger_str = f"[T:{int(fingers[0])}, I:{int(fingers[1])}, M:{int(fingers[2])}, R:{int(fingers[3])}, P:{int(fingers[4])}]"
+                        # Debug output, only formatted and drawn with debug on
+                        debug = draw and debug_enabled()
+                        if debug:
+                            fingers = code_to_fingers(code)
+                            finger_str = f"[T:{int(fingers[0])}, I:{int(fingers[1])}, M:{int(fingers[2])}, R:{int(fingers[3])}, P:{int(fingers[4])}]"
+                        
+                        self.mode_history.append(gesture_mode)
+                        self.confirmation_frames = (
+                            self.mode_history.count(gesture_mode) if gesture_mode else 0
+                        )
                         
                         if gesture_mode:
-                            self.confirmation_frames += 1
-                            
-                            # Display gesture being detected
                             mode_name = gesture_mode.replace("_", " ").upper()
-                            cv2.putText(frame, f"Detected: {mode_name}", (15, h - 80),
-                                       cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 255), 2)
-                            cv2.putText(frame, f"Fingers: {finger_str}", (15, h - 110),
-                                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, (200, 255, 100), 1)
-                            cv2.putText(frame, f"Hold to confirm: {self.confirmation_frames}/{self.CONFIRMATION_FRAMES}", 
-                                       (15, h - 40),
-                                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 0), 1)
-                            
-                            # Progress bar
-                            bar_width = int((self.confirmation_frames / self.CONFIRMATION_FRAMES) * 300)
-                            cv2.rectangle(frame, (15, h - 20), (15 + bar_width, h - 10), (0, 255, 0), -1)
-                            cv2.rectangle(frame, (15, h - 20), (315, h - 10), (255, 255, 255), 2)
+                            if draw:
+                                # Display gesture being detected
+                                self.text.put(frame, f"Detected: {mode_name}", (15, h - 80), 0.8, (0, 255, 255), 2)
+                                if debug:
+                                    self.text.put(frame, f"Fingers: {finger_str}", (15, h - 110), 0.6, (200, 255, 100), 1)
+                                self.text.put(frame, f"Hold to confirm: {self.confirmation_frames}/{self.CONFIRMATION_FRAMES}",
+                                              (15, h - 40), 0.6, (255, 255, 0), 1)
+                                
+                                # Progress bar
+                                bar_width = int((self.confirmation_frames / self.CONFIRMATION_FRAMES) * 300)
+                                cv2.rectangle(frame, (15, h - 20), (15 + bar_width, h - 10), (0, 255, 0), -1)
+                                cv2.rectangle(frame, (15, h - 20), (315, h - 10), (255, 255, 255), 2)
                             
                             # Enter mode if confirmation frames reached
                             if self.confirmation_frames >= self.CONFIRMATION_FRAMES:
                                 print(f"\n>>> MODE SELECTED: {mode_name} <<<")
                                 self.enter_mode(gesture_mode)
-                                self.confirmation_frames = 0
-                        else:
+                        elif draw:
                             # Show what fingers are Up (for debugging)
-                            cv2.putText(frame, f"Fingers: {finger_str}", (15, h - 40),
-                                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, (100, 200, 255), 1)
-                            cv2.putText(frame, "Make a gesture to begin", (15, h - 80),
-                                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, (200, 200, 200), 1)
-                            self.confirmation_frames = 0
+                            if debug:
+                                self.text.put(frame, f"Fingers: {finger_str}", (15, h - 40), 0.6, (100, 200, 255), 1)
+                            self.text.put(frame, "Make a gesture to begin", (15, h - 80), 0.6, (200, 200, 200), 1)
                 else:
+                    self.mode_history.append(None)
                     self.confirmation_frames = 0
                 
-                cv2.imshow("Master Gesture Controller", frame)
-                
-                key = cv2.waitKey(1) & 0xFF
-                if key == 27:  # ESC key
+                if show_frame("Master Gesture Controller", frame, 27):  # ESC key
                     print("\nExiting Master Gesture Controller...")
                     break
                     
@@ -285,43 +369,70 @@ class MasterGestureController:
                 print(f"Error in main loop: {e}")
                 break
         
+        self._stop_capture()
         self.cap.release()
         cv2.destroyAllWindows()
 
+    def _start_capture(self):
+        # Mode gestures are held for many frames; ~20 FPS is plenty, and
+        # frames in between are grabbed but never decoded.  Inference runs on
+        # a downscaled copy; landmarks are normalized, so they are drawn on
+        # the full-size frame unchanged
+        self.capture = HandPipeline(self.cap, self.hands,
+                                    infer_every=self.INFER_EVERY,
+                                    max_fps=self.PROCESS_FPS).start()
+
+    def _stop_capture(self):
+        if self.capture is not None:
+            self.capture.stop()
+            self.capture = None
+
+    PROCESS_FPS = 20
+
+    # Modes that accept the controller's camera; the rest open their own, so
+    # the camera is released for them and re-opened afterwards
+    SHARED_CAMERA_MODES = {"file_mode", "scroll_mode", "zoom_mode", "ss_mode"}
+
     def enter_mode(self, mode_name):
         """Enter the specified gesture mode"""
-        self.cap.release()
+        self._stop_capture()
         cv2.destroyAllWindows()
-        time.sleep(0.5)
+        share_camera = mode_name in self.SHARED_CAMERA_MODES
+        if not share_camera:
+            self.cap.release()
+            time.sleep(0.5)
         
         try:
             if mode_name == "file_mode":
                 print("\n>>> Entering FILE OPENING MODE <<<\n")
-                # Use existing HandFileOpener.run()
-                opener = HandFileOpener()
-                opener.run()
+                # One HandFileOpener kept across entries, reset to its menu
+                if self.file_opener is None:
+                    self.file_opener = HandFileOpener(hands=self.hands, cap=self.cap)
+                else:
+                    self.file_opener.reset(cap=self.cap)
+                self.file_opener.run()
 
             elif mode_name == "scroll_mode":
                 print("\n>>> Entering SCROLL MODE <<<\n")
                 # Delegate to scroll module
-                run_scroll()
+                run_scroll(self.hands, self.cap)
 
             elif mode_name == "zoom_mode":
                 print("\n>>> Entering ZOOM MODE <<<\n")
                 # Delegate to Zoom module
-                run_zoom()
+                run_zoom(self.hands, self.cap)
 
             elif mode_name == "slide_mode":
                 print("\n>>> Entering SLIDE TRAVEL MODE <<<\n")
                 # Auto-start slideshow if PowerPoint is already open
                 start_ppt_slideshow(wait=1.5)
                 # Delegate to slidetravel module
-                run_slide_travel()
+                run_slide_travel(self.hands)
 
             elif mode_name == "ss_mode":
                 print("\n>>> Entering SCREENSHOT MODE <<<\n")
                 # Delegate to gesture_screenshot module
-                run_screenshot()
+                run_screenshot(self.hands, self.cap)
 
             elif mode_name == "video_mode":
                 print("\n>>> Entering VIDEO PLAYER MODE <<<\n")
@@ -338,12 +449,16 @@ class MasterGestureController:
         except Exception as e:
             print(f"Error running mode: {e}")
         
-        # Reinitialize camera and detector for detection mode
+        # Reinitialize camera (only if it was handed over) for detection mode
         print("\n>>> Returning to DETECTION MODE <<<\n")
-        self.cap = cv2.VideoCapture(0)
-        time.sleep(1)
+        # open_camera blocks until the device is open, so no settle delay
+        if not share_camera:
+            self.cap = open_camera()
+        self.last_result = None
+        self._start_capture()
         # Reset confirmation frames to prevent accidental re-entry
         self.confirmation_frames = 0
+        self.mode_history.clear()
 
 
 # ==================== MAIN ENTRY POINT ====================
@@ -0,0 +1,140 @@
+"""native_input.py
+Direct OS input calls for the per-frame gesture paths.
+
+pyautogui wraps every call in fail-safe checks, a PAUSE sleep and a fresh
+platform shim lookup.  That is fine for an occasional click but adds
+milliseconds to a cursor update issued every frame, so the platform API is
+resolved once here and called directly.  Scroll and key presses get the
+same treatment on Windows, where pyautogui's default 0.1 s PAUSE would
+otherwise follow every gesture action; a key press or chord goes out as
+one batched SendInput call, with no sleep between down and up.  Falls back
+to pyautogui (without the PAUSE) when no native backend is available.
+"""
+
+import sys
+
+import pyautogui
+
+_move = None
+_scroll = None
+_press = None
+
+if sys.platform == "win32":
+    try:
+        import ctypes
+        from ctypes import wintypes
+        _user32 = ctypes.windll.user32
+
+        MOUSEEVENTF_WHEEL = 0x0800
+        KEYEVENTF_KEYUP = 0x0002
+        INPUT_KEYBOARD = 1
+
+        class _MOUSEINPUT(ctypes.Structure):
+            _fields_ = [("dx", wintypes.LONG), ("dy", wintypes.LONG),
+                        ("mouseData", wintypes.DWORD), ("dwFlags", wintypes.DWORD),
+                        ("time", wintypes.DWORD), ("dwExtraInfo", ctypes.c_size_t)]
+
+        class _KEYBDINPUT(ctypes.Structure):
+            _fields_ = [("wVk", wintypes.WORD), ("wScan", wintypes.WORD),
+                        ("dwFlags", wintypes.DWORD), ("time", wintypes.DWORD),
+                        ("dwExtraInfo", ctypes.c_size_t)]
+
+        class _INPUTUNION(ctypes.Union):
+            # MOUSEINPUT is the largest member and fixes sizeof(INPUT)
+            _fields_ = [("mi", _MOUSEINPUT), ("ki", _KEYBDINPUT)]
+
+        class _INPUT(ctypes.Structure):
+            _fields_ = [("type", wintypes.DWORD), ("u", _INPUTUNION)]
+
+        _INPUT_SIZE = ctypes.sizeof(_INPUT)
+        # Reused event arrays, one per key count; a press only writes wVk
+        _key_batches = {}
+
+        def _send_keys(vks):
+            # Every key down in order, then up in reverse, in one SendInput
+            n = len(vks)
+            batch = _key_batches.get(n)
+            if batch is None:
+                batch = _key_batches[n] = (_INPUT * (2 * n))()
+                for i, ev in enumerate(batch):
+                    ev.type = INPUT_KEYBOARD
+                    ev.u.ki.dwFlags = KEYEVENTF_KEYUP if i >= n else 0
+            for i, vk in enumerate(vks):
+                batch[i].u.ki.wVk = vk
+                batch[2 * n - 1 - i].u.ki.wVk = vk
+            return _user32.SendInput(2 * n, batch, _INPUT_SIZE) == 2 * n
+        # pyautogui key names used by the gesture modes -> virtual-key codes
+        _VK = {
+            'left': 0x25, 'up': 0x26, 'right': 0x27, 'down': 0x28,
+            'pageup': 0x21, 'pagedown': 0x22, 'escape': 0x1B, 'esc': 0x1B,
+            'space': 0x20, 'enter': 0x0D, 'tab': 0x09, 'f4': 0x73, 'f5': 0x74,
+            'alt': 0x12, 'ctrl': 0x11, 'shift': 0x10,
+            'nexttrack': 0xB0, 'prevtrack': 0xB1, 'playpause': 0xB3,
+        }
+
+        def _move(x, y):
+            _user32.SetCursorPos(int(x), int(y))
+
+        def _scroll(amount):
+            # Same units as pyautogui.scroll on Windows: raw wheel delta
+            _user32.mouse_event(MOUSEEVENTF_WHEEL, 0, 0, int(amount), 0)
+
+        def _press(*keys):
+            vks = [_VK.get(k) for k in keys]
+            if None in vks:
+                return False
+            return _send_keys(vks)
+    except Exception:
+        _move = _scroll = _press = None
+
+elif sys.platform == "darwin":
+    try:
+        import Quartz
+
+        def _move(x, y):
+            event = Quartz.CGEventCreateMouseEvent(
+                None, Quartz.kCGEventMouseMoved, (x, y), Quartz.kCGMouseButtonLeft
+            )
+            Quartz.CGEventPost(Quartz.kCGHIDEventTap, event)
+    except Exception:
+        _move = None
+
+else:
+    try:
+        from Xlib import display as _xdisplay
+        _disp = _xdisplay.Display()
+        _root = _disp.screen().root
+
+        def _move(x, y):
+            _root.warp_pointer(int(x), int(y))
+            _disp.sync()
+    except Exception:
+        _move = None
+
+
+def move_cursor(x, y):
+    """Move the mouse cursor to screen coordinates (x, y)."""
+    if _move is not None:
+        _move(x, y)
+    else:
+        pyautogui.moveTo(x, y, duration=0)
+
+
+def scroll(amount):
+    """Scroll the mouse wheel by `amount` (positive is up)."""
+    if _scroll is not None:
+        _scroll(amount)
+    else:
+        pyautogui.scroll(amount, _pause=False)
+
+
+def press_key(key):
+    """Tap `key`, given by its pyautogui name ('left', 'right', ...)."""
+    if _press is None or not _press(key):
+        pyautogui.press(key, _pause=False)
+
+
+def hotkey(*keys):
+    """Press `keys` together (e.g. 'alt', 'f4') and release them in reverse."""
+    if _press is None or not _press(*keys):
+        pyautogui.hotkey(*keys, _pause=False)
@@ -1,11 +1,19 @@
 import cv2
-import mediapipe as mp
 import numpy as np
 import os
+import threading
 import time
 import pyautogui
 from pathlib import Path
 
+from frame_pipeline import HandPipeline, open_camera
+from gesture_kernels import (fold_finger_code, hand_size, landmarks_to_array,
+                             pinch_distance, tip_wrist_distance, warm_up)
+from hand_detector_pool import get_hands
+from overlay import StaticOverlay, draw_hand, show_frame
+
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+
 try:
     import pygetwindow as gw
 except Exception:
@@ -20,31 +28,36 @@ except Exception:
 
 
 class HandFileOpener:
-    def __init__(self, root_dir=None):
+    def __init__(self, root_dir=None, hands=None, cap=None):
         self.root = Path(root_dir or Path(__file__).parent)
-        self.mp_hands = mp.solutions.hands
-        self.hands = self.mp_hands.Hands(max_num_hands=1, min_detection_confidence=0.6)
-        self.mp_draw = mp.solutions.drawing_utils
-        self.cap = cv2.VideoCapture(0)
-        self.state = 'menu'  # menu, browse, opened
-        self.choice = None
-        self.files = []
-        self.page = 0
+        # Detector shared with the caller or taken from the pool, so opening
+        # the file browser again does not reload the model
+        self.hands = hands or get_hands(max_hands=1, det=0.6, track=0.5)
+        # A camera passed in by the caller stays open for it after run()
+        self._own_cap = cap is None
+        self.cap = open_camera() if self._own_cap else cap
+        # Hold times are 0.3 s and up, so landmarks from every other frame are
+        # enough; the smoothed cursor hides the reuse in between
+        self.infer_every = 2
+        self._pipeline = None
+        self._last_res = None
+        # Menu / file-list borders and labels, rendered once per layout
+        self._menu_bg = None
+        self._filelist_bg = None
+        self._filelist_key = None
         self.per_page = 8
         self.last_opened = None
-        self.pinched = False
-        self.last_pinchtime = 0
-        self.pinch_start = None
+        # window of last_opened, found in the background after it opens
+        self._opened_hwnd = None
         self.PINCH_HOLD = 0.35  # seconds required to hold pinch to confirm selection
-        self.cursor = None
         self.cursor_alpha = 0.35  # smoothing factor (0..1)
-        self.back_start = None
         self.BACK_HOLD = 0.3
         self.FIST_HOLD = 0.35
-        self.fist_start = None
         # Master-exit gesture settings (thumb + index + pinky)
         self.MASTER_EXIT_HOLD = 2.0
-        self.master_exit_start = None
+        self.reset()
+        # Compile the landmark kernels before the first hand shows up
+        warm_up()
 
         self.types = [
             ('Word', ('.docx', '.doc')),
@@ -52,64 +65,166 @@ class HandFileOpener:
             ('Excel', ('.xlsx', '.xls')),
             ('PDF', ('.pdf',))
         ]
+        # extension -> index into self.types, for the one-pass scan
+        self._type_of_ext = {ext: i for i, (_, exts) in enumerate(self.types) for ext in exts}
+        # (x0, y0, x1, y1) of every menu item and file row, for the
+        # vectorized hit tests and the cached backgrounds
+        self._menu_rects = np.array(
+            [(50, y - 30, 280, y + 10) for y in range(40, 40 + 80 * len(self.types), 80)],
+            dtype=np.int32)
+        self._file_rects = np.array(
+            [(40, y - 30, 750, y + 10) for y in range(80, 80 + 50 * self.per_page, 50)],
+            dtype=np.int32)
+        self._files_by_type = None
+        self._scan_time = 0.0
+        self._root_mtime = None
+        self.RESCAN_AFTER = 60.0  # seconds before a cached scan is refreshed
+
+    def reset(self, cap=None):
+        """Return to the menu with no gesture in progress.
+
+        Lets a caller keep one opener (and its buffers) across entries;
+        `cap` swaps in the caller's current camera if it was re-opened.
+        """
+        if cap is not None:
+            self.cap = cap
+        self.state = 'menu'  # menu, browse, opened
+        self.choice = None
+        self.files = []
+        self.page = 0
+        self.pinched = False
+        self.last_pinchtime = 0
+        self.pinch_start = None
+        self.cursor_x = self.cursor_y = None
+        self.back_start = None
+        self.fist_start = None
+        self.master_exit_start = None
+        self._last_res = None
 
-    def find_files(self, exts):
-        results = []
-        for dirpath, dirnames, filenames in os.walk(self.root):
-            for f in filenames:
-                if f.lower().endswith(exts):
-                    results.append(os.path.join(dirpath, f))
-        return results
-
-    def detect_pinch(self, lm, img_w, img_h):
-        # lm expected to be list of landmarks normalized
-        x_thumb, y_thumb = lm[4].x * img_w, lm[4].y * img_h
-        x_index, y_index = lm[8].x * img_w, lm[8].y * img_h
-        dist = np.hypot(x_thumb - x_index, y_thumb - y_index)
-
-        # compute a reference hand size (wrist to middle-finger-mcp) so thresholds scale with distance
-        ref_x, ref_y = lm[9].x * img_w, lm[9].y * img_h
-        wrist_x, wrist_y = lm[0].x * img_w, lm[0].y * img_h
-        hand_size = np.hypot(ref_x - wrist_x, ref_y - wrist_y)
+    def _scan(self, path, buckets):
+        # os.scandir hands back cached entry types, so no stat per file;
+        # files of a folder come before its subfolders, like os.walk
+        subdirs = []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                            continue
+                    except OSError:
+                        continue
+                    i = self._type_of_ext.get(os.path.splitext(entry.name)[1].lower())
+                    if i is not None:
+                        buckets[i].append(entry.path)
+        except OSError:
+            return
+        for d in subdirs:
+            self._scan(d, buckets)
+
+    def find_files(self, type_idx):
+        """Files of `self.types[type_idx]` under the root, from a cached scan.
+
+        The whole tree is walked once for all types; the walk is repeated
+        only when the root folder changed or the scan is RESCAN_AFTER old.
+        """
+        try:
+            mtime = os.stat(self.root).st_mtime
+        except OSError:
+            mtime = None
+        now = time.time()
+        if (self._files_by_type is None or mtime != self._root_mtime
+                or now - self._scan_time > self.RESCAN_AFTER):
+            buckets = [[] for _ in self.types]
+            self._scan(self.root, buckets)
+            self._files_by_type = buckets
+            self._scan_time = now
+            self._root_mtime = mtime
+        return self._files_by_type[type_idx]
+
+    @staticmethod
+    def hand_size(pts):
+        # reference hand size (wrist to middle-finger-mcp) so thresholds scale with distance
         # safety: avoid zero
-        hand_size = max(hand_size, 20.0)
+        return hand_size(pts, 20.0)
+
+    def detect_pinch(self, pts):
+        # pts: (21, 2) float32 landmarks in pixel coordinates
+        dist = pinch_distance(pts)
+        size = self.hand_size(pts)
 
         # pinch triggered when thumb-index distance is small relative to hand size
-        pinch_thresh = hand_size * 0.28
+        pinch_thresh = size * 0.28
         is_pinched = dist < pinch_thresh
-        return is_pinched, (int(x_index), int(y_index)), dist, hand_size
+        return is_pinched, (int(pts[8, 0]), int(pts[8, 1])), dist, size
 
-    def detect_fist(self, lm, img_w, img_h):
+    def detect_fist(self, pts, hand_size=None):
         # measure average distance of fingertips to wrist and scale by hand size
-        wrist = np.array([lm[0].x * img_w, lm[0].y * img_h])
-        tips_idx = [8, 12, 16, 20]
-        dists = []
-        for i in tips_idx:
-            p = np.array([lm[i].x * img_w, lm[i].y * img_h])
-            dists.append(np.linalg.norm(p - wrist))
-        avg = np.mean(dists)
-
-        # hand size reference
-        ref_x, ref_y = lm[9].x * img_w, lm[9].y * img_h
-        wrist_x, wrist_y = lm[0].x * img_w, lm[0].y * img_h
-        hand_size = np.hypot(ref_x - wrist_x, ref_y - wrist_y)
-        hand_size = max(hand_size, 20.0)
+        avg = tip_wrist_distance(pts)
+        if hand_size is None:
+            hand_size = self.hand_size(pts)
 
         # when fist, avg fingertip distance to wrist should be small relative to hand size
         # use a slightly more forgiving multiplier so fist works at varying distances
         return avg < (hand_size * 0.7)
 
-    def detect_back_gesture(self, lm, img_w, img_h):
+    def detect_back_gesture(self, pts):
         # index and middle finger up, ring and pinky down -> back gesture
         # compare tip y to pip y: tip.y < pip.y means finger is extended (camera coords)
+        return (fold_finger_code(pts, 0.0) & 0b01111) == 0b01100
+
+    @staticmethod
+    def _find_window(title_substr):
+        # stop at the first top-level window whose title matches
+        found = []
+
+        def enum_cb(hwnd, _):
+            txt = win32gui.GetWindowText(hwnd)
+            if txt and title_substr in txt.lower():
+                found.append(hwnd)
+                return False
+            return True
+
+        try:
+            win32gui.EnumWindows(enum_cb, None)
+        except Exception:
+            pass  # pywin32 raises when the callback ends enumeration early
+        return found[0] if found else None
+
+    def _watch_opened_window(self, path):
+        """Find the window of a just-opened document off the main loop.
+
+        The handle lets the fist-close be one WM_CLOSE post instead of a
+        scan over every top-level window.  The viewer may take a few
+        seconds to show its window, so the lookup is retried briefly.
+        """
+        self._opened_hwnd = None
+        if not win32gui:
+            return
+        title_substr = os.path.basename(path).lower()
+
+        def watch():
+            for _ in range(5):
+                time.sleep(1.0)
+                if self.last_opened != path:
+                    return
+                hwnd = self._find_window(title_substr)
+                if hwnd:
+                    self._opened_hwnd = hwnd
+                    return
+
+        threading.Thread(target=watch, daemon=True).start()
+
+    def _close_opened(self):
+        """Close last_opened's window, by cached handle when one was found."""
+        hwnd, self._opened_hwnd = self._opened_hwnd, None
         try:
-            idx_up = lm[8].y < lm[6].y
-            mid_up = lm[12].y < lm[10].y
-            ring_down = lm[16].y > lm[14].y
-            pinky_down = lm[20].y > lm[18].y
-            return bool(idx_up and mid_up and ring_down and pinky_down)
+            if hwnd and win32gui.IsWindow(hwnd):
+                win32gui.PostMessage(hwnd, win32con.WM_CLOSE, 0, 0)
+                return True
         except Exception:
-            return False
+            pass
+        return self.close_window_by_title(os.path.basename(self.last_opened))
 
     def close_window_by_title(self, title_substr):
         """Try several methods to close a window whose title contains title_substr.
@@ -165,72 +280,76 @@ class HandFileOpener:
         return False
 
     def run(self):
+        # Capture, mirroring, downscaling and MediaPipe run on the pipeline
+        # threads, so inference on the next frame overlaps the drawing and
+        # gesture handling below
+        self._pipeline = HandPipeline(self.cap, self.hands,
+                                      infer_every=self.infer_every,
+                                      idle_gate=True).start()
         while True:
-            ret, frame = self.cap.read()
-            if not ret:
+            item = self._pipeline.read()
+            if item is None:
                 break
-            frame = cv2.flip(frame, 1)
+            # One timestamp per frame (the capture's monotonic stamp) for
+            # every hold timer below
+            frame, new_res, now = item
             h, w, _ = frame.shape
-            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            res = self.hands.process(rgb)
+            # Skipped frames arrive with None and reuse the last landmarks
+            if new_res is not None:
+                self._last_res = new_res
+            res = self._last_res
 
             cursor = None
             pinch = False
             fist = False
 
-            if res.multi_hand_landmarks:
-                lm = res.multi_hand_landmarks[0].landmark
-                pinch_res = self.detect_pinch(lm, w, h)
-                if len(pinch_res) == 4:
-                    pinch, cursor_pt, pinch_dist, hand_size = pinch_res
-                else:
-                    pinch, cursor_pt = pinch_res
-                    pinch_dist, hand_size = 0, 1
-                fist = self.detect_fist(lm, w, h)
-                back_g = self.detect_back_gesture(lm, w, h)
-                self.mp_draw.draw_landmarks(frame, res.multi_hand_landmarks[0], self.mp_hands.HAND_CONNECTIONS)
+            # Tasks-native landmark list: no Solutions proto view is built
+            if res is not None and res.hand_landmarks:
+                lm = res.hand_landmarks[0]
+                # One (21, 2) array per frame: normalized for the finger
+                # tests, scaled to pixels for the distance-based ones
+                norm = landmarks_to_array(lm)
+                pts = norm * np.array((w, h), dtype=np.float32)
+                pinch, cursor_pt, pinch_dist, hand_size = self.detect_pinch(pts)
+                fist = self.detect_fist(pts, hand_size)
+                back_g = self.detect_back_gesture(pts)
+                draw_hand(frame, lm)
 
                 # smooth cursor
                 if cursor_pt is not None:
-                    if self.cursor is None:
-                        self.cursor = np.array(cursor_pt, dtype=float)
+                    # two scalar EMAs: no per-frame array for a 2-vector
+                    if self.cursor_x is None:
+                        self.cursor_x, self.cursor_y = cursor_pt
                     else:
-                        self.cursor = (1 - self.cursor_alpha) * self.cursor + self.cursor_alpha * np.array(cursor_pt, dtype=float)
-                    cursor = (int(self.cursor[0]), int(self.cursor[1]))
+                        a = self.cursor_alpha
+                        self.cursor_x += a * (cursor_pt[0] - self.cursor_x)
+                        self.cursor_y += a * (cursor_pt[1] - self.cursor_y)
+                    cursor = (int(self.cursor_x), int(self.cursor_y))
 
                 # --- Master-exit gesture detection (thumb + index + pinky) ---
-                try:
-                    thumb_up = lm[4].x < lm[3].x
-                    idx_up = lm[8].y < lm[6].y - 0.02
-                    mid_up = lm[12].y < lm[10].y - 0.02
-                    ring_up = lm[16].y < lm[14].y - 0.02
-                    pinky_up = lm[20].y < lm[18].y - 0.02
-                    # pattern: thumb, index, pinky up; middle and ring down
-                    if thumb_up and idx_up and pinky_up and (not mid_up) and (not ring_up):
-                        if self.master_exit_start is None:
-                            self.master_exit_start = time.time()
-                        else:
-                            if time.time() - self.master_exit_start >= self.MASTER_EXIT_HOLD:
-                                print("Master-exit gesture held — returning to master controller...")
-                                self.cap.release()
-                                cv2.destroyAllWindows()
-                                return
+                # pattern: thumb, index, pinky up; middle and ring down
+                if fold_finger_code(norm, 0.02) == 0b11001:
+                    if self.master_exit_start is None:
+                        self.master_exit_start = now
                     else:
-                        self.master_exit_start = None
-                except Exception:
-                    # ignore landmark indexing errors
+                        if now - self.master_exit_start >= self.MASTER_EXIT_HOLD:
+                            print("Master-exit gesture held — returning to master controller...")
+                            self._release_camera()
+                            cv2.destroyAllWindows()
+                            return
+                else:
                     self.master_exit_start = None
 
             # global fist-close (works from any state) - requires last_opened
             if self.last_opened and fist:
                 # require hold to avoid accidental closes
                 if self.fist_start is None:
-                    self.fist_start = time.time()
-                f_elapsed = time.time() - self.fist_start
+                    self.fist_start = now
+                f_elapsed = now - self.fist_start
                 if cursor:
-                    cv2.putText(frame, 'Close: {:.0f}%'.format(min(100, int(f_elapsed / self.FIST_HOLD * 100))), (50, 430), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (200, 180, 180), 2)
+                    cv2.putText(frame, 'Close: {:.0f}%'.format(min(100, int(f_elapsed / self.FIST_HOLD * 100))), (50, 430), FONT, 0.8, (200, 180, 180), 2)
                 if f_elapsed >= self.FIST_HOLD:
-                    closed = self.close_window_by_title(os.path.basename(self.last_opened))
+                    closed = self._close_opened()
                     if not closed:
                         try:
                             # fallback: activate and send Alt+F4
@@ -252,8 +371,8 @@ class HandFileOpener:
                 # require pinch to be held for PINCH_HOLD seconds
                 if pinch:
                     if self.pinch_start is None:
-                        self.pinch_start = time.time()
-                    elapsed = time.time() - self.pinch_start
+                        self.pinch_start = now
+                    elapsed = now - self.pinch_start
                     # draw hold progress
                     if cursor:
                         cv2.circle(frame, cursor, 18, (255, 255, 255), 1)
@@ -264,11 +383,11 @@ class HandFileOpener:
                         sel = self.menu_hit_test(cursor, frame.shape)
                         if sel is not None:
                             self.choice = sel
-                            self.files = self.find_files(self.types[sel][1])
+                            self.files = self.find_files(sel)
                             self.page = 0
                             self.state = 'browse'
                         self.pinched = True
-                        self.last_pinchtime = time.time()
+                        self.last_pinchtime = now
                 else:
                     self.pinch_start = None
 
@@ -277,8 +396,8 @@ class HandFileOpener:
                 # same held-pinch logic for opening files
                 if pinch:
                     if self.pinch_start is None:
-                        self.pinch_start = time.time()
-                    elapsed = time.time() - self.pinch_start
+                        self.pinch_start = now
+                    elapsed = now - self.pinch_start
                     if cursor:
                         cv2.circle(frame, cursor, 14, (255, 255, 255), 1)
                         if elapsed > 0:
@@ -293,6 +412,7 @@ class HandFileOpener:
                                 try:
                                     os.startfile(path)
                                     self.last_opened = path
+                                    self._watch_opened_window(path)
                                     # move to 'opened' state so user can fist-close
                                     self.state = 'opened'
                                     self.choice = None
@@ -303,17 +423,17 @@ class HandFileOpener:
                                 except Exception as e:
                                     print('Open error', e)
                         self.pinched = True
-                        self.last_pinchtime = time.time()
+                        self.last_pinchtime = now
                 else:
                     self.pinch_start = None
 
                 # back gesture (index+middle) with hold to navigate back
                 if back_g:
                     if self.back_start is None:
-                        self.back_start = time.time()
-                    back_elapsed = time.time() - self.back_start
+                        self.back_start = now
+                    back_elapsed = now - self.back_start
                     if cursor:
-                            cv2.putText(frame, 'Back: {:.0f}%'.format(min(100, int(back_elapsed / self.BACK_HOLD * 100))), (50, 460), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
+                            cv2.putText(frame, 'Back: {:.0f}%'.format(min(100, int(back_elapsed / self.BACK_HOLD * 100))), (50, 460), FONT, 0.8, (255, 255, 255), 2)
                     if back_elapsed >= self.BACK_HOLD:
                         # go back to menu
                         self.state = 'menu'
@@ -330,10 +450,10 @@ class HandFileOpener:
                 # back gesture (index+middle) returns to menu WITHOUT closing the file
                 if back_g:
                     if self.back_start is None:
-                        self.back_start = time.time()
-                    back_elapsed = time.time() - self.back_start
+                        self.back_start = now
+                    back_elapsed = now - self.back_start
                     if cursor:
-                        cv2.putText(frame, 'Back: {:.0f}%'.format(min(100, int(back_elapsed / self.BACK_HOLD * 100))), (50, 460), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (200, 220, 255), 2)
+                        cv2.putText(frame, 'Back: {:.0f}%'.format(min(100, int(back_elapsed / self.BACK_HOLD * 100))), (50, 460), FONT, 0.8, (200, 220, 255), 2)
                     if back_elapsed >= self.BACK_HOLD:
                         self.state = 'menu'
                         self.back_start = None
@@ -346,87 +466,85 @@ class HandFileOpener:
                 self.pinched = False
                 self.pinch_start = None
 
-            cv2.imshow('File Opener', frame)
-            key = cv2.waitKey(1) & 0xFF
-            if key == 27:  # ESC
+            if show_frame('File Opener', frame, 27):  # ESC
                 break
 
-        self.cap.release()
+        self._release_camera()
         cv2.destroyAllWindows()
 
+    def _release_camera(self):
+        # The pipeline must stop before the camera goes away under it
+        self._pipeline.stop()
+        if self._own_cap:
+            self.cap.release()
+
+    @staticmethod
+    def _hit(rects, cursor):
+        # index of the first rect strictly containing cursor, or None
+        if not cursor:
+            return None
+        cx, cy = cursor
+        hit = np.flatnonzero((cx > rects[:, 0]) & (cx < rects[:, 2])
+                             & (cy > rects[:, 1]) & (cy < rects[:, 3]))
+        return int(hit[0]) if len(hit) else None
+
     def draw_menu(self, img, cursor):
         h, w, _ = img.shape
-        start_y = 40
-        gap = 80
-        x = 60
-        for i, (name, _) in enumerate(self.types):
-            y = start_y + i * gap
-            # draw thin white border box (transparent inside)
-            cv2.rectangle(img, (x - 10, y - 30), (x + 220, y + 10), (255, 255, 255), 1)
-            cv2.putText(img, name, (x, y), cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 0, 0), 1)
-            if cursor:
-                cx, cy = cursor
-                if x - 10 < cx < x + 220 and y - 30 < cy < y + 10:
-                    # hover: slightly thicker white border
-                    cv2.rectangle(img, (x - 10, y - 30), (x + 220, y + 10), (255, 255, 255), 2)
+        if self._menu_bg is None or not self._menu_bg.fits(img):
+            def paint(bg):
+                for (name, _), (x0, y0, x1, y1) in zip(self.types, self._menu_rects.tolist()):
+                    # draw thin white border box (transparent inside)
+                    cv2.rectangle(bg, (x0, y0), (x1, y1), (255, 255, 255), 1)
+                    # (1, 1, 1) reads as black; pure black would be masked out
+                    cv2.putText(bg, name, (x0 + 10, y1 - 10), FONT, 1.0, (1, 1, 1), 1)
+            self._menu_bg = StaticOverlay(h, w, paint)
+        self._menu_bg.apply(img)
+        # hover: slightly thicker white border
+        i = self.menu_hit_test(cursor, img.shape)
+        if i is not None:
+            x0, y0, x1, y1 = self._menu_rects[i].tolist()
+            cv2.rectangle(img, (x0, y0), (x1, y1), (255, 255, 255), 2)
 
     def menu_hit_test(self, cursor, shape):
-        if not cursor:
-            return None
-        h, w, _ = shape
-        start_y = 40
-        gap = 80
-        x = 60
-        for i in range(len(self.types)):
-            y = start_y + i * gap
-            cx, cy = cursor
-            if x - 10 < cx < x + 220 and y - 30 < cy < y + 10:
-                return i
-        return None
+        return self._hit(self._menu_rects, cursor)
 
     def draw_file_list(self, img, cursor):
         h, w, _ = img.shape
-        title = self.types[self.choice][0] + ' files'
-        cv2.putText(img, title, (40, 40), cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 0, 0), 1)
-        y0 = 80
-        gap = 50
         start = self.page * self.per_page
-        for i in range(self.per_page):
-            idx = start + i
-            y = y0 + i * gap
-            if idx < len(self.files):
-                name = os.path.basename(self.files[idx])
-                # transparent row with thin white border
-                cv2.rectangle(img, (40, y - 30), (750, y + 10), (255, 255, 255), 1)
-                cv2.putText(img, name, (50, y), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 0), 1)
-                if cursor:
-                    cx, cy = cursor
-                    if 40 < cx < 750 and y - 30 < cy < y + 10:
-                        cv2.rectangle(img, (40, y - 30), (750, y + 10), (255, 255, 255), 2)
+        count = max(0, min(self.per_page, len(self.files) - start))
+        # Rebuilt only when another type or page is shown
+        key = (img.shape, self.choice, self.page, len(self.files))
+        if self._filelist_bg is None or key != self._filelist_key:
+            def paint(bg):
+                title = self.types[self.choice][0] + ' files'
+                cv2.putText(bg, title, (40, 40), FONT, 1.0, (1, 1, 1), 1)
+                for i in range(count):
+                    x0, y0, x1, y1 = self._file_rects[i].tolist()
+                    name = os.path.basename(self.files[start + i])
+                    # transparent row with thin white border
+                    cv2.rectangle(bg, (x0, y0), (x1, y1), (255, 255, 255), 1)
+                    cv2.putText(bg, name, (x0 + 10, y1 - 10), FONT, 0.6, (1, 1, 1), 1)
+            self._filelist_bg = StaticOverlay(h, w, paint)
+            self._filelist_key = key
+        self._filelist_bg.apply(img)
+        i = self.file_hit_test(cursor, img.shape)
+        if i is not None and i < count:
+            x0, y0, x1, y1 = self._file_rects[i].tolist()
+            cv2.rectangle(img, (x0, y0), (x1, y1), (255, 255, 255), 2)
 
     def file_hit_test(self, cursor, shape):
-        if not cursor:
-            return None
-        h, w, _ = shape
-        y0 = 80
-        gap = 50
-        for i in range(self.per_page):
-            y = y0 + i * gap
-            cx, cy = cursor
-            if 40 < cx < 750 and y - 30 < cy < y + 10:
-                return i
-        return None
+        return self._hit(self._file_rects, cursor)
 
     def draw_opened(self, img):
         h, w, _ = img.shape
         fname = os.path.basename(self.last_opened) if self.last_opened else ''
         # header bar
         cv2.rectangle(img, (20, 20), (w - 20, 70), (255, 255, 255), 1)
-        cv2.putText(img, 'Opened: ' + fname, (40, 52), cv2.FONT_HERSHEY_SIMPLEX, 0.75, (255, 255, 255), 2)
+        cv2.putText(img, 'Opened: ' + fname, (40, 52), FONT, 0.75, (255, 255, 255), 2)
         # hint: fist to close
-        cv2.putText(img, 'FIST  -> close document', (40, 110), cv2.FONT_HERSHEY_SIMPLEX, 0.65, (200, 180, 180), 2)
+        cv2.putText(img, 'FIST  -> close document', (40, 110), FONT, 0.65, (200, 180, 180), 2)
         # hint: back gesture to return to menu
-        cv2.putText(img, 'PEACE -> back to menu', (40, 145), cv2.FONT_HERSHEY_SIMPLEX, 0.65, (180, 210, 255), 2)
+        cv2.putText(img, 'PEACE -> back to menu', (40, 145), FONT, 0.65, (180, 210, 255), 2)
 
 
 def main():
@@ -0,0 +1,197 @@
+"""overlay.py
+Cheap drawing helpers shared by the gesture modes.
+
+`cv2.putText` rasterizes every glyph on every call, so static on-screen
+guidance costs several milliseconds per frame once a few lines of text are
+involved.  `StaticOverlay` draws those invariant elements once into an
+off-screen image and copies them onto each frame with one masked write;
+`TextCache` does the same per string for dynamic text that only cycles
+through a few values.
+
+`draw_hand` replaces `mp_drawing.draw_landmarks`, which issues one `cv2.line`
+and one `cv2.circle` per joint from Python, with a single `cv2.polylines`
+call over a precomputed connection list.
+
+`show_frame` wraps the `imshow` + `waitKey` pair so the preview can be turned
+off: each `imshow` copies the frame to a window surface and `waitKey(1)`
+sleeps for the event pump, which is wasted when nobody is watching.
+"""
+
+import os
+import signal
+import threading
+
+import cv2
+import numpy as np
+
+# Off by default: only the hand's bounding box is drawn.  Set GESTURE_DEBUG=1
+# for the full skeleton; pressing 'd' in any preview window toggles it at runtime
+DEBUG = os.environ.get("GESTURE_DEBUG", "0") != "0"
+DEBUG_KEY = ord('d')
+
+# Set GESTURE_UI=0 to run headless: no preview window and no waitKey pump
+SHOW_UI = os.environ.get("GESTURE_UI", "1") != "0"
+
+# (N, 2) landmark index pairs, matching mp.solutions.hands.HAND_CONNECTIONS.
+# Spelled out so importing this module does not pull in MediaPipe.
+HAND_CONNECTIONS = np.array([
+    (0, 1), (1, 2), (2, 3), (3, 4),            # thumb
+    (0, 5), (5, 6), (6, 7), (7, 8),            # index
+    (5, 9), (9, 10), (10, 11), (11, 12),       # middle
+    (9, 13), (13, 14), (14, 15), (15, 16),     # ring
+    (13, 17), (0, 17), (17, 18), (18, 19), (19, 20),  # pinky + palm
+], dtype=np.int32)
+
+
+def debug_enabled():
+    """Current debug-drawing state (it can change while a mode runs)."""
+    return DEBUG
+
+
+def draw_hand(frame, landmarks, color=(255, 255, 255), thickness=1):
+    """Draw the hand skeleton for 21 normalized landmarks in one native call.
+
+    `landmarks` is any sequence of objects with `.x`/`.y` (a Solutions
+    `hand.landmark` or a Tasks `hand_landmarks[i]`).  With DEBUG off only
+    the hand's bounding box is drawn, as minimal visual feedback.
+    """
+    h, w = frame.shape[:2]
+    pts = np.fromiter(
+        (c for lm in landmarks for c in (lm.x * w, lm.y * h)),
+        dtype=np.float32, count=42
+    ).reshape(21, 2).astype(np.int32)
+    if DEBUG:
+        cv2.polylines(frame, pts[HAND_CONNECTIONS], False, color, thickness, cv2.LINE_AA)
+    else:
+        x, y, bw, bh = cv2.boundingRect(pts)
+        cv2.rectangle(frame, (x, y), (x + bw, y + bh), color, thickness)
+
+
+class StaticOverlay:
+    """Invariant HUD elements rendered once and mask-copied onto frames.
+
+    `draw` is called once with a black (h, w, 3) image to paint into; every
+    non-black pixel it leaves behind is copied onto each frame by `apply`.
+    Pure black elements are therefore invisible to the mask.
+    """
+
+    def __init__(self, h, w, draw):
+        self.image = np.zeros((h, w, 3), dtype=np.uint8)
+        draw(self.image)
+        self.mask = self.image.any(axis=2)[..., None]
+
+    def fits(self, frame):
+        return frame.shape[:2] == self.image.shape[:2]
+
+    def apply(self, frame):
+        np.copyto(frame, self.image, where=self.mask)
+
+
+class HeaderBar:
+    """Opaque banner across the top `height` rows, rendered once.
+
+    Unlike `StaticOverlay` no mask is needed: the banner covers its rows
+    completely, so `apply` is a single contiguous row copy.
+    """
+
+    def __init__(self, height, w, draw):
+        self.image = np.zeros((height, w, 3), dtype=np.uint8)
+        draw(self.image)
+
+    def fits(self, frame):
+        return frame.shape[1] == self.image.shape[1]
+
+    def apply(self, frame):
+        frame[:self.image.shape[0]] = self.image
+
+
+class TextCache:
+    """`cv2.putText` replacement that rasterizes each distinct string once.
+
+    HUD text that changes per frame usually cycles through a handful of
+    values (a mode name, a hold counter, a finger readout).  Each distinct
+    (text, scale, color, thickness) is rendered once into a small sprite and
+    mask-copied onto frames afterwards, so the glyphs are not redrawn every
+    frame.  Output matches `putText` with the default LINE_8 line type.
+    """
+
+    def __init__(self, font=cv2.FONT_HERSHEY_SIMPLEX, max_items=256):
+        self.font = font
+        self.max_items = max_items
+        self._sprites = {}
+
+    def _render(self, text, scale, color, thickness):
+        (tw, th), baseline = cv2.getTextSize(text, self.font, scale, thickness)
+        pad = thickness
+        img = np.zeros((th + baseline + 2 * pad, tw + 2 * pad, 3), dtype=np.uint8)
+        cv2.putText(img, text, (pad, th + pad), self.font, scale, color, thickness)
+        # Same trick as StaticOverlay: black pixels are treated as empty
+        return img, img.any(axis=2)[..., None], th + pad
+
+    def put(self, frame, text, org, scale, color, thickness=1):
+        key = (text, scale, color, thickness)
+        sprite = self._sprites.get(key)
+        if sprite is None:
+            if len(self._sprites) >= self.max_items:
+                self._sprites.clear()
+            sprite = self._sprites[key] = self._render(text, scale, color, thickness)
+        img, mask, ascent = sprite
+
+        # Place the sprite so its baseline lands on `org`, clipped to the frame
+        x0 = org[0] - thickness
+        y0 = org[1] - ascent
+        fh, fw = frame.shape[:2]
+        sh, sw = img.shape[:2]
+        sx, sy = max(0, -x0), max(0, -y0)
+        ex, ey = min(sw, fw - x0), min(sh, fh - y0)
+        if sx >= ex or sy >= ey:
+            return
+        np.copyto(frame[y0 + sy:y0 + ey, x0 + sx:x0 + ex],
+                  img[sy:ey, sx:ex], where=mask[sy:ey, sx:ex])
+
+
+# pollKey (OpenCV >= 4.5) pumps window events without waitKey's 1 ms sleep
+_poll_key = getattr(cv2, "pollKey", None) or (lambda: cv2.waitKey(1))
+
+_stop_requested = threading.Event()
+_sigint_installed = False
+
+
+def _window_shown(title):
+    """Create `title` on first use; False while it exists but is hidden."""
+    try:
+        visible = cv2.getWindowProperty(title, cv2.WND_PROP_VISIBLE)
+    except cv2.error:
+        visible = -1
+    if visible < 0:
+        # GUI_NORMAL skips the Qt toolbar/status bar and their relayouts
+        cv2.namedWindow(title, cv2.WINDOW_AUTOSIZE | cv2.WINDOW_GUI_NORMAL)
+        return True
+    return visible >= 1
+
+
+def show_frame(title, frame, quit_key):
+    """Show `frame` and return True once the user asked to quit.
+
+    With the preview on, quitting is pressing `quit_key`, and DEBUG_KEY
+    toggles debug drawing; the frame is not copied to a window the backend
+    reports as hidden.  Headless, the window and key pump are skipped
+    and Ctrl+C requests the stop instead, so the caller's loop still
+    reaches its normal cleanup.
+    """
+    global _sigint_installed, DEBUG
+    if SHOW_UI:
+        if _window_shown(title):
+            cv2.imshow(title, frame)
+        key = _poll_key() & 0xFF
+        if key == DEBUG_KEY:
+            DEBUG = not DEBUG
+        return key == quit_key
+
+    if not _sigint_installed:
+        _sigint_installed = True
+        try:
+            signal.signal(signal.SIGINT, lambda *_: _stop_requested.set())
+        except ValueError:
+            pass  # Not on the main thread; Ctrl+C keeps its default behaviour
+    return _stop_requested.is_set()
@@ -1,13 +1,13 @@
 #complete
 import cv2
-import mediapipe as mp
-import pyautogui
+import re
 import time
-import numpy as np
 
-# MediaPipe setup
-mp_hands = mp.solutions.hands
-mp_draw = mp.solutions.drawing_utils
+from gesture_kernels import hand_size, tip_wrist_distance
+from gesture_loop import GestureLoop
+from hand_detector_pool import get_hands
+from native_input import hotkey, press_key
+from overlay import StaticOverlay, TextCache
 
 try:
     import pygetwindow as gw
@@ -24,40 +24,38 @@ except Exception:
 FIST_HOLD = 0.6   # seconds to hold fist to close PPT
 
 
-def fingers_up(hand):
-    tips = [4, 8, 12, 16, 20]
-    fingers = []
+def _is_fist(pts):
+    """All four finger tips close to wrist → fist.  `pts` is (21, 2) normalized."""
+    # Scalar kernels: no temporary arrays for a handful of distances
+    return tip_wrist_distance(pts) < hand_size(pts, 0.01) * 0.72
 
-    # Thumb
-    fingers.append(hand.landmark[tips[0]].x < hand.landmark[tips[0] - 1].x)
 
-    # Other fingers
-    for i in range(1, 5):
-        fingers.append(hand.landmark[tips[i]].y < hand.landmark[tips[i] - 2].y)
-
-    return fingers  # [thumb, index, middle, ring, pinky]
-
-
-def _is_fist(hand):
-    """All four finger tips close to wrist → fist."""
-    lm = hand.landmark
-    wrist = np.array([lm[0].x, lm[0].y])
-    tips = [8, 12, 16, 20]
-    ref = max(0.01, np.hypot(lm[9].x - lm[0].x, lm[9].y - lm[0].y))
-    avg = np.mean([np.hypot(lm[i].x - wrist[0], lm[i].y - wrist[1]) for i in tips])
-    return avg < ref * 0.72
+# Window class of PowerPoint's main frame; the slideshow itself is 'screenClass'
+PPT_WINDOW_CLASSES = ('PPTFrameClass', 'screenClass')
+# Lower-cased window titles that belong to PowerPoint
+_PPT_TITLE_RE = re.compile(r'powerpoint|\.pptx?')
 
 
 def _close_ppt():
     """Close any open PowerPoint window. Returns True if closed."""
     closed = False
-    keywords = ('powerpoint', '.pptx', '.ppt')
+
+    # Method 0: look the windows up by class, without enumerating anything
+    try:
+        if win32gui and win32con:
+            for cls in PPT_WINDOW_CLASSES:
+                hwnd = win32gui.FindWindow(cls, None)
+                if hwnd:
+                    win32gui.PostMessage(hwnd, win32con.WM_CLOSE, 0, 0)
+                    closed = True
+    except Exception:
+        pass
 
     # Method 1: pygetwindow
     try:
-        if gw:
+        if gw and not closed:
             wins = [w for w in gw.getAllWindows()
-                    if any(k in w.title.lower() for k in keywords)]
+                    if w.title and _PPT_TITLE_RE.search(w.title.lower())]
             for w in wins:
                 try:
                     w.activate()
@@ -76,10 +74,15 @@ def _close_ppt():
                 found = []
                 def _cb(hwnd, extra):
                     txt = win32gui.GetWindowText(hwnd)
-                    if txt and any(k in txt.lower() for k in keywords):
+                    if txt and _PPT_TITLE_RE.search(txt.lower()):
                         win32gui.PostMessage(hwnd, win32con.WM_CLOSE, 0, 0)
                         extra.append(hwnd)
-                win32gui.EnumWindows(_cb, found)
+                        return False  # stop at the first PowerPoint window
+                    return True
+                try:
+                    win32gui.EnumWindows(_cb, found)
+                except Exception:
+                    pass  # pywin32 raises when the callback ends enumeration early
                 closed = bool(found)
         except Exception:
             pass
@@ -87,9 +90,9 @@ def _close_ppt():
     # Method 3: Escape first (exit slideshow), then Alt+F4
     if not closed:
         try:
-            pyautogui.press('escape')   # exit slideshow → back to normal view
+            press_key('escape')   # exit slideshow → back to normal view
             time.sleep(0.3)
-            pyautogui.hotkey('alt', 'f4')
+            hotkey('alt', 'f4')
             closed = True
         except Exception:
             pass
@@ -97,7 +100,14 @@ def _close_ppt():
     return closed
 
 
-def run_slide_travel():
+# 5-bit finger code (thumb<<4 ... pinky) -> (message, key)
+SLIDE_ACTIONS = {
+    0b01000: ("NEXT SLIDE", "right"),      # ☝️ Index finger only
+    0b01100: ("PREVIOUS SLIDE", "left"),   # ✌️ Index + Middle
+}
+
+
+def run_slide_travel(hands=None):
     """Run the slide travel (PPT gesture control) mode."""
     print("\n========== SLIDE TRAVEL MODE ACTIVE ==========")
     print("  ☝️  Index finger only          → NEXT SLIDE")
@@ -107,92 +117,71 @@ def run_slide_travel():
     print("  Press ESC to EXIT")
     print("===============================================\n")
 
-    hands = mp_hands.Hands(
-        max_num_hands=1,
-        min_detection_confidence=0.7,
-        min_tracking_confidence=0.7
-    )
-    cap = cv2.VideoCapture(0)
-    last_action_time = time.time()
+    # Shared Tasks detector (GPU delegate when available, else CPU), from
+    # the caller or the pool; tracking at 0.5 keeps re-detection rare
+    if hands is None:
+        hands = get_hands(max_hands=1, det=0.7, track=0.5)
+    last_action_time = time.monotonic()
     fist_start = None
-
-    while True:
-        success, frame = cap.read()
-        if not success:
-            break
-
-        frame = cv2.flip(frame, 1)
-        h, w, _ = frame.shape
-        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        result = hands.process(rgb)
-
-        fist_detected = False
-
-        if result.multi_hand_landmarks:
-            for hand_landmarks in result.multi_hand_landmarks:
-                mp_draw.draw_landmarks(
-                    frame, hand_landmarks, mp_hands.HAND_CONNECTIONS
-                )
-
-                fingers = fingers_up(hand_landmarks)
-                fist_detected = _is_fist(hand_landmarks)
-                current_time = time.time()
-
-                # ── Fist → close PPT ────────────────────────────────
-                if fist_detected:
-                    if fist_start is None:
-                        fist_start = current_time
-                    elapsed = current_time - fist_start
-                    pct = min(1.0, elapsed / FIST_HOLD)
-                    bar_w = int(pct * (w - 40))
-                    cv2.rectangle(frame, (20, h - 40), (20 + bar_w, h - 25), (60, 60, 220), -1)
-                    cv2.rectangle(frame, (20, h - 40), (w - 20,     h - 25), (255, 255, 255), 1)
-                    cv2.putText(frame, f'CLOSING PPT... {int(pct*100)}%',
-                                (24, h - 27), cv2.FONT_HERSHEY_SIMPLEX, 0.55, (150, 150, 255), 1)
-                    if elapsed >= FIST_HOLD:
-                        print("FIST — closing PowerPoint...")
-                        _close_ppt()
-                        fist_start = None
-                        last_action_time = current_time
-                else:
-                    fist_start = None
-
-                # ── Exit to master gesture ───────────────────────────
-                if fingers[0] and fingers[1] and fingers[4] and not fingers[2] and not fingers[3]:
-                    print("EXIT GESTURE detected — returning to Master Controller...")
-                    cap.release()
-                    cv2.destroyAllWindows()
-                    return
-
-                # Cooldown to avoid multiple slide jumps
-                if current_time - last_action_time > 1 and not fist_detected:
-
-                    # ☝️ Index finger only → Next Slide
-                    if fingers == [False, True, False, False, False]:
-                        print("NEXT SLIDE")
-                        pyautogui.press("right")
-                        last_action_time = current_time
-
-                    # ✌️ Index + Middle → Previous Slide
-                    elif fingers == [False, True, True, False, False]:
-                        print("PREVIOUS SLIDE")
-                        pyautogui.press("left")
-                        last_action_time = current_time
-
-        else:
-            fist_start = None  # reset if no hand visible
-
-        # Hint overlay
-        cv2.putText(frame, '☝=Next  ✌=Prev  Fist=ClosePPT  T+I+P=Exit',
-                    (10, 25), cv2.FONT_HERSHEY_SIMPLEX, 0.55, (255, 255, 255), 1)
-
-        cv2.imshow("PPT Gesture Control", frame)
-
-        if cv2.waitKey(1) & 0xFF == 27:  # ESC key
-            break
-
-    cap.release()
-    cv2.destroyAllWindows()
+    # Close-progress label and bar outline, rasterized once
+    text = TextCache()
+    bar_outline = None
+
+    def on_hand(frame, pts, code, now):
+        nonlocal last_action_time, fist_start, bar_outline
+        h, w = frame.shape[:2]
+        fist_detected = _is_fist(pts)
+
+        # ── Fist → close PPT ────────────────────────────────
+        if fist_detected:
+            if fist_start is None:
+                fist_start = now
+            elapsed = now - fist_start
+            pct = min(1.0, elapsed / FIST_HOLD)
+            bar_w = int(pct * (w - 40))
+            # Filled part is a plain slice fill; same pixels as cv2.rectangle
+            frame[h - 40:h - 24, 20:21 + bar_w] = (60, 60, 220)
+            if bar_outline is None or not bar_outline.fits(frame):
+                bar_outline = StaticOverlay(h, w, lambda img: cv2.rectangle(
+                    img, (20, h - 40), (w - 20, h - 25), (255, 255, 255), 1))
+            bar_outline.apply(frame)
+            text.put(frame, f'CLOSING PPT... {int(pct*100)}%',
+                     (24, h - 27), 0.55, (150, 150, 255))
+            if elapsed >= FIST_HOLD:
+                print("FIST — closing PowerPoint...")
+                _close_ppt()
+                fist_start = None
+                last_action_time = now
+            return
+        fist_start = None
+
+        # Cooldown to avoid multiple slide jumps
+        action = SLIDE_ACTIONS.get(code)
+        if action is not None and now - last_action_time > 1:
+            message, key = action
+            print(message)
+            press_key(key)
+            last_action_time = now
+
+    def on_no_hand(frame, now):
+        nonlocal fist_start
+        fist_start = None  # reset if no hand visible
+
+    hint = None
+
+    def on_frame(frame):
+        nonlocal hint
+        # Hint overlay, rendered once for the frame size
+        if hint is None or not hint.fits(frame):
+            h, w = frame.shape[:2]
+            hint = StaticOverlay(h, w, lambda img: cv2.putText(
+                img, '☝=Next  ✌=Prev  Fist=ClosePPT  T+I+P=Exit',
+                (10, 25), cv2.FONT_HERSHEY_SIMPLEX, 0.55, (255, 255, 255), 1))
+        hint.apply(frame)
+
+    # The exit gesture returns to the master immediately (no hold)
+    GestureLoop("PPT Gesture Control", hands, on_hand,
+                on_no_hand=on_no_hand, on_frame=on_frame).run()
     print("Exiting Slide Travel Mode...")
 
 
@@ -12,6 +12,9 @@ Notes:
 - This file is intentionally simpler and more robust than the previous iterative edits.
 """
 import os
+import queue
+import re
+import threading
 import time
 import subprocess
 from pathlib import Path
@@ -24,6 +27,11 @@ import cv2
 import mediapipe as mp
 import numpy as np
 
+from frame_pipeline import HandPipeline, open_camera
+from gesture_kernels import hand_features, landmarks_to_array, warm_up
+from native_input import press_key
+from overlay import StaticOverlay, TextCache, draw_hand, show_frame
+
 try:
     import psutil
 except Exception:
@@ -34,35 +42,58 @@ try:
 except Exception:
     gw = None
 
-import ctypes
-user32 = ctypes.windll.user32
+# winsound.Beep blocks for the whole tone, so tones are played one after
+# another on a worker thread instead of stalling the gesture loop
+_beeps = queue.Queue()
 
-# Media key constants
-KEYEVENTF_KEYUP = 0x0002
-VK_MEDIA_NEXT = 0xB0
-VK_MEDIA_PREV = 0xB1
-VK_MEDIA_PLAY_PAUSE = 0xB3
 
-def send_media_key(vk):
-    try:
-        user32.keybd_event(vk, 0, 0, 0)
-        time.sleep(0.05)
-        user32.keybd_event(vk, 0, KEYEVENTF_KEYUP, 0)
-    except Exception:
-        pass
+def _beep_worker():
+    while True:
+        freq, ms = _beeps.get()
+        try:
+            winsound.Beep(freq, ms)
+        except Exception:
+            pass
+
+
+if winsound:
+    threading.Thread(target=_beep_worker, daemon=True).start()
+
+
+def beep(freq, ms):
+    """Queue a tone and return immediately."""
+    if winsound:
+        _beeps.put((freq, ms))
+
+
+# pyautogui names of the media keys (see native_input)
+KEY_MEDIA_NEXT = 'nexttrack'
+KEY_MEDIA_PREV = 'prevtrack'
+KEY_MEDIA_PLAY_PAUSE = 'playpause'
 
 
 VIDEO_DIR = Path(__file__).parent / 'VIDEO_FOLDER'
-VIDEO_EXTS = ('.mp4', '.mkv', '.avi', '.mov', '.wmv', '.webm')
+VIDEO_EXTS = frozenset(('.mp4', '.mkv', '.avi', '.mov', '.wmv', '.webm'))
 
 def find_videos():
+    # os.scandir reports entry types without a stat per file; an explicit
+    # stack replaces os.walk's per-directory lists
     vids = []
-    if not VIDEO_DIR.exists():
-        return vids
-    for root, _, files in os.walk(VIDEO_DIR):
-        for f in files:
-            if f.lower().endswith(VIDEO_EXTS):
-                vids.append(os.path.join(root, f))
+    stack = [str(VIDEO_DIR)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                            continue
+                    except OSError:
+                        continue
+                    if os.path.splitext(entry.name)[1].lower() in VIDEO_EXTS:
+                        vids.append(entry.path)
+        except OSError:
+            continue
     vids.sort()
     return vids
 
@@ -91,38 +122,65 @@ def shutil_which(name):
         return None
 
 
-def detect_spawned_pids(target_path, sleep=0.6):
-    """Attempt to detect newly spawned processes that reference target_path (requires psutil)."""
+# Process names of the players open_video may end up launching
+_PLAYER_RE = re.compile(r'vlc|mpv|wmplayer|potplayer|mpc')
+
+
+def find_player_process(path, since, poll=0.25, timeout=3.0):
+    """PID of the player that opened `path` at or after `since`, or None.
+
+    `os.startfile` does not report what it started, so processes created
+    since the launch (`time.time()` stamp) are looked at, polled every
+    `poll` seconds: one whose command line names the file wins, otherwise
+    one named like a known player.  A player that hands the file to an
+    instance that was already running is not found.  Requires psutil.
+    """
     if not psutil:
-        return []
-    before = {p.pid for p in psutil.process_iter(attrs=['pid'])}
-    time.sleep(sleep)
-    found = []
-    target_basename = os.path.basename(target_path).lower()
-    for p in psutil.process_iter(attrs=['pid', 'name', 'cmdline']):
-        try:
-            if p.pid in before:
+        return None
+    target = os.path.normcase(os.path.abspath(path))
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        time.sleep(poll)
+        fallback = None
+        for proc in psutil.process_iter(['name', 'create_time']):
+            info = proc.info
+            if (info['create_time'] or 0) < since - 0.5:
                 continue
-            name = (p.info.get('name') or '').lower()
-            cmd = ' '.join(p.info.get('cmdline') or []).lower()
-            if target_basename in cmd or target_basename in name or any(k in name for k in ('vlc','mpv','wmplayer','potplayer','mpc')):
-                found.append(p.pid)
-        except Exception:
-            continue
-    return found
+            try:
+                cmdline = proc.cmdline()
+            except psutil.Error:
+                cmdline = ()
+            if any(os.path.normcase(arg) == target for arg in cmdline):
+                return proc.pid
+            if fallback is None and _PLAYER_RE.search((info['name'] or '').lower()):
+                fallback = proc.pid
+        if fallback is not None:
+            return fallback
+    return None
 
 
 class VideoController:
     def __init__(self):
         self.videos = find_videos()
+        # PATH and install-dir probe done once, not on every open
+        self.vlc_exe = find_vlc_exe()
         self.last_pid = None
         self.last_path = None
 
-        self.mp_hands = mp.solutions.hands
-        self.hands = self.mp_hands.Hands(max_num_hands=1, min_detection_confidence=0.6)
-        self.mp_draw = mp.solutions.drawing_utils
-
-        self.cap = cv2.VideoCapture(0)
+        # Lite model (model_complexity=0): plenty for pinch/finger checks
+        self.hands = mp.solutions.hands.Hands(max_num_hands=1, min_detection_confidence=0.6,
+                                              model_complexity=0)
+        # The hand's landmarks are copied into this once per frame and every
+        # test below reads the array, not the landmark protos
+        self._pts = np.empty((21, 2), dtype=np.float32)
+
+        self.cap = open_camera()
+        self.capture = None
+        self._last_result = None
+        # Header hint and video list panel, rendered on the first frame
+        self._hint = None
+        self._panel = None
+        self.text = TextCache()
         self.cursor = None
         self.cursor_smooth = None
         self.CURSOR_ALPHA = 0.35
@@ -136,40 +194,18 @@ class VideoController:
         self.prev_start = None
         self.exit_start = None
         self.pinch_start = None
+        # Compile the landmark kernel before the first hand shows up
+        warm_up()
 
-    def hand_size(self, lm, w, h):
-        ref_x, ref_y = lm[9].x * w, lm[9].y * h
-        wrist_x, wrist_y = lm[0].x * w, lm[0].y * h
-        return max(20.0, np.hypot(ref_x - wrist_x, ref_y - wrist_y))
-
-    def is_fist(self, lm, w, h):
-        wrist = np.array([lm[0].x * w, lm[0].y * h])
-        tips = [8, 12, 16, 20]
-        dists = [np.linalg.norm(np.array([lm[i].x * w, lm[i].y * h]) - wrist) for i in tips]
-        avg = np.mean(dists)
-        hs = self.hand_size(lm, w, h)
-        return avg < (hs * 0.75)
-
-    def finger_up(self, lm, tip, pip):
-        return lm[tip].y < lm[pip].y
-
-    def detect_pinch(self, lm, w, h):
-        x_thumb, y_thumb = lm[4].x * w, lm[4].y * h
-        x_index, y_index = lm[8].x * w, lm[8].y * h
-        dist = np.hypot(x_thumb - x_index, y_thumb - y_index)
-        hs = self.hand_size(lm, w, h)
-        thresh = hs * 0.28
-        return dist < thresh, (int(x_index), int(y_index))
-
-    def can_trigger(self):
-        if time.time() - self.last_action > self.COOLDOWN:
-            self.last_action = time.time()
+    def can_trigger(self, now):
+        if now - self.last_action > self.COOLDOWN:
+            self.last_action = now
             return True
         return False
 
     def open_video(self, path):
         # prefer VLC so we can control/close reliably
-        vlc = find_vlc_exe()
+        vlc = self.vlc_exe
         if vlc:
             try:
                 proc = subprocess.Popen([vlc, '--play-and-exit', path])
@@ -179,27 +215,29 @@ class VideoController:
             except Exception:
                 pass
 
-        # fallback: start default handler and try to detect spawned pid (requires psutil)
+        # fallback: the default handler through os.startfile (ShellExecute),
+        # so the file name never passes through a command-line parser; the
+        # player's pid is picked up in the background (requires psutil)
+        # while the gesture loop keeps running
+        launched = time.time()
         try:
             os.startfile(path)
-            pids = detect_spawned_pids(path)
-            if pids:
-                self.last_pid = pids[0]
-                self.last_path = path
-            else:
-                self.last_pid = None
-                self.last_path = path
-            return True
         except Exception:
             return False
+        self.last_pid = None
+        self.last_path = path
+
+        def watch():
+            pid = find_player_process(path, launched)
+            if pid and self.last_path == path:
+                self.last_pid = pid
+
+        threading.Thread(target=watch, daemon=True).start()
+        return True
 
     def close_last(self):
         if not self.last_path and not self.last_pid:
-            try:
-                if winsound:
-                    winsound.Beep(600, 120)
-            except Exception:
-                pass
+            beep(600, 120)
             return False
 
         closed = False
@@ -231,56 +269,83 @@ class VideoController:
                 pass
 
         if closed:
-            try:
-                if winsound:
-                    winsound.Beep(800, 120)
-            except Exception:
-                pass
+            beep(800, 120)
             self.last_pid = None
             self.last_path = None
             return True
 
         return False
 
+    def _build_ui(self, h, w):
+        """Render the header hint and the video list panel for an h x w frame."""
+        def hint(img):
+            cv2.putText(img, 'Video Control — hold gesture to confirm', (12, 20), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255,255,255), 1)
+        self._hint = StaticOverlay(h, w, hint)
+
+        # Drawn at frame coordinates on a scratch frame, then cut out
+        canvas = np.zeros((h, w, 3), dtype=np.uint8)
+        col_x1 = w - 360
+        col_x2 = w - 12
+        cv2.rectangle(canvas, (col_x1, 56), (col_x2, h-16), (240,240,240), -1)
+        cv2.rectangle(canvas, (col_x1, 56), (col_x2, h-16), (180,180,180), 1)
+        cv2.putText(canvas, 'Videos:', (col_x1+10, 76), cv2.FONT_HERSHEY_SIMPLEX, 0.58, (20,20,20), 1)
+        gap = 38
+        for i, p in enumerate(self.videos[:10]):
+            y = 86 + i*gap
+            name = os.path.basename(p)
+            short = name if len(name) < 36 else name[:33] + '...'
+            cv2.putText(canvas, short, (col_x1+12, y), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (10,10,10), 1)
+        self._panel = canvas[56:h-15, col_x1:col_x2+1].copy()
+
     def run(self):
         cv2.namedWindow('Video Control', cv2.WINDOW_NORMAL)
+        # Capture, mirroring, downscaling and MediaPipe run on the pipeline
+        # threads; this thread keeps the gesture state, drawing and imshow
+        # (HighGUI windows belong to the thread that created them).  Frames
+        # the pipeline did not infer (unchanged picture) arrive with
+        # result=None and reuse the last landmarks.
+        self.capture = HandPipeline(self.cap, self.hands, still_gate=True).start()
         while True:
-            ret, frame = self.cap.read()
-            if not ret:
+            item = self.capture.read()
+            if item is None:
                 break
-
-            frame = cv2.flip(frame, 1)
+            # The capture's monotonic stamp is the one clock for every hold
+            # and cooldown check this frame
+            frame, new_result, now = item
             h, w, _ = frame.shape
-            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            result = self.hands.process(rgb)
+            if new_result is not None:
+                self._last_result = new_result
+            result = self._last_result
 
             gesture = None
             cursor = None
 
-            if result.multi_hand_landmarks:
+            if result is not None and result.multi_hand_landmarks:
                 lm = result.multi_hand_landmarks[0].landmark
-                self.mp_draw.draw_landmarks(frame, result.multi_hand_landmarks[0], self.mp_hands.HAND_CONNECTIONS)
+                pts = landmarks_to_array(lm, self._pts)
+                draw_hand(frame, lm)
+
+                # Finger, fist and pinch tests in one compiled call
+                code, fist, pinch, px, py = hand_features(pts, w, h, 0.75, 0.28)
+                index_up, middle_up, ring_up = code & 8, code & 4, code & 2
 
                 # cursor smoothing
-                raw = (int(lm[8].x * w), int(lm[8].y * h))
+                raw = (int(px), int(py))
+                # two scalar EMAs: no per-frame array for a 2-vector
                 if self.cursor_smooth is None:
-                    self.cursor_smooth = np.array(raw, dtype=float)
+                    self.cursor_smooth = (float(raw[0]), float(raw[1]))
                 else:
-                    self.cursor_smooth = (1 - self.CURSOR_ALPHA) * self.cursor_smooth + self.CURSOR_ALPHA * np.array(raw, dtype=float)
+                    sx, sy = self.cursor_smooth
+                    a = self.CURSOR_ALPHA
+                    self.cursor_smooth = (sx + a * (raw[0] - sx), sy + a * (raw[1] - sy))
                 cursor = (int(self.cursor_smooth[0]), int(self.cursor_smooth[1]))
 
-                index_up = self.finger_up(lm, 8, 6)
-                middle_up = self.finger_up(lm, 12, 10)
-                ring_up = self.finger_up(lm, 16, 14)
-                fist = self.is_fist(lm, w, h)
-                pinch, pinch_pt = self.detect_pinch(lm, w, h)
-
                 # Fist -> close
                 if fist:
                     gesture = 'exit'
                     if self.exit_start is None:
-                        self.exit_start = time.time()
-                    if time.time() - self.exit_start >= self.HOLD_TIME and self.can_trigger():
+                        self.exit_start = now
+                    if now - self.exit_start >= self.HOLD_TIME and self.can_trigger(now):
                         self.close_last()
                         self.exit_start = None
                 else:
@@ -290,14 +355,10 @@ class VideoController:
                 if index_up and not middle_up and not ring_up:
                     gesture = 'next'
                     if self.next_start is None:
-                        self.next_start = time.time()
-                    if time.time() - self.next_start >= self.HOLD_TIME and self.can_trigger():
-                        send_media_key(VK_MEDIA_NEXT)
-                        try:
-                            if winsound:
-                                winsound.Beep(1200, 100)
-                        except Exception:
-                            pass
+                        self.next_start = now
+                    if now - self.next_start >= self.HOLD_TIME and self.can_trigger(now):
+                        press_key(KEY_MEDIA_NEXT)
+                        beep(1200, 100)
                         self.next_start = None
                 else:
                     self.next_start = None
@@ -306,14 +367,10 @@ class VideoController:
                 if index_up and middle_up and not ring_up:
                     gesture = 'prev'
                     if self.prev_start is None:
-                        self.prev_start = time.time()
-                    if time.time() - self.prev_start >= self.HOLD_TIME and self.can_trigger():
-                        send_media_key(VK_MEDIA_PREV)
-                        try:
-                            if winsound:
-                                winsound.Beep(900, 100)
-                        except Exception:
-                            pass
+                        self.prev_start = now
+                    if now - self.prev_start >= self.HOLD_TIME and self.can_trigger(now):
+                        press_key(KEY_MEDIA_PREV)
+                        beep(900, 100)
                         self.prev_start = None
                 else:
                     self.prev_start = None
@@ -322,60 +379,51 @@ class VideoController:
                 if index_up and middle_up and ring_up:
                     gesture = 'play'
                     if self.play_start is None:
-                        self.play_start = time.time()
-                    if time.time() - self.play_start >= self.HOLD_TIME and self.can_trigger():
-                        send_media_key(VK_MEDIA_PLAY_PAUSE)
-                        try:
-                            if winsound:
-                                winsound.Beep(1000, 100)
-                        except Exception:
-                            pass
+                        self.play_start = now
+                    if now - self.play_start >= self.HOLD_TIME and self.can_trigger(now):
+                        press_key(KEY_MEDIA_PLAY_PAUSE)
+                        beep(1000, 100)
                         self.play_start = None
                 else:
                     self.play_start = None
 
             # UI: header + debug
-            cv2.putText(frame, 'Video Control — hold gesture to confirm', (12, 20), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255,255,255), 1)
+            if self._panel is None or not self._hint.fits(frame):
+                self._build_ui(h, w)
+            self._hint.apply(frame)
             if gesture:
-                cv2.putText(frame, f'Detected: {gesture}', (12, h-20), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0,255,0), 2)
+                self.text.put(frame, f'Detected: {gesture}', (12, h-20), 0.7, (0,255,0), 2)
             if cursor:
                 cv2.circle(frame, cursor, 6, (255,255,255), -1)
 
             # draw video list
             col_x1 = w - 360
             col_x2 = w - 12
-            cv2.rectangle(frame, (col_x1, 56), (col_x2, h-16), (240,240,240), -1)
-            cv2.rectangle(frame, (col_x1, 56), (col_x2, h-16), (180,180,180), 1)
-            cv2.putText(frame, 'Videos:', (col_x1+10, 76), cv2.FONT_HERSHEY_SIMPLEX, 0.58, (20,20,20), 1)
+            # opaque panel: one block copy of the pre-rendered list
+            frame[56:h-15, col_x1:col_x2+1] = self._panel
 
             gap = 38
             for i, p in enumerate(self.videos[:10]):
                 y = 86 + i*gap
-                name = os.path.basename(p)
-                short = name if len(name) < 36 else name[:33] + '...'
-                cv2.putText(frame, short, (col_x1+12, y), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (10,10,10), 1)
                 # hover/open
                 if cursor and (col_x1 < cursor[0] < col_x2) and (y-20 < cursor[1] < y+6):
                     cv2.rectangle(frame, (col_x1+2, y-22), (col_x2-2, y+8), (150,150,150), 2)
                     if pinch:
                         if self.pinch_start is None:
-                            self.pinch_start = time.time()
-                        if time.time() - self.pinch_start >= self.HOLD_TIME:
+                            self.pinch_start = now
+                        if now - self.pinch_start >= self.HOLD_TIME:
                             opened = self.open_video(p)
                             if opened:
-                                try:
-                                    if winsound:
-                                        winsound.Beep(1200, 120)
-                                except Exception:
-                                    pass
+                                beep(1200, 120)
                             self.pinch_start = None
                     else:
                         self.pinch_start = None
 
-            cv2.imshow('Video Control', frame)
-            if cv2.waitKey(1) & 0xFF == 27:
+            if show_frame('Video Control', frame, 27):
                 break
 
+        # The pipeline must stop before the camera goes away under it
+        self.capture.stop()
         self.cap.release()
         cv2.destroyAllWindows()
 
@@ -26,13 +26,17 @@ Gesture summary
 
 import cv2
 import mediapipe as mp
-import numpy as np
 import os
+import threading
 import time
-import ctypes
-import pyautogui
 from pathlib import Path
 
+from frame_pipeline import HandPipeline, open_camera
+from gesture_kernels import (fold_finger_code, hand_features,
+                             landmarks_to_array, span_finger_code, warm_up)
+from native_input import hotkey, press_key
+from overlay import StaticOverlay, draw_hand, show_frame
+
 try:
     import pygetwindow as gw
 except Exception:
@@ -45,23 +49,6 @@ except Exception:
     win32gui = None
     win32con = None
 
-# ---------------------------------------------------------------------------
-# Optional Windows media-key support
-# ---------------------------------------------------------------------------
-try:
-    _user32 = ctypes.windll.user32
-    _KEYEVENTF_KEYUP  = 0x0002
-    _VK_MEDIA_PLAY_PAUSE = 0xB3
-
-    def _send_play_pause():
-        _user32.keybd_event(_VK_MEDIA_PLAY_PAUSE, 0, 0, 0)
-        time.sleep(0.05)
-        _user32.keybd_event(_VK_MEDIA_PLAY_PAUSE, 0, _KEYEVENTF_KEYUP, 0)
-
-except Exception:
-    def _send_play_pause():
-        pass  # non-Windows fallback
-
 # ---------------------------------------------------------------------------
 # Constants
 # ---------------------------------------------------------------------------
@@ -76,6 +63,11 @@ PALM_COOLDOWN     = 1.5   # cooldown between consecutive play/pause triggers
 MASTER_EXIT_HOLD  = 2.0   # seconds to hold master-exit gesture
 CURSOR_ALPHA      = 0.35  # lower = smoother cursor (exponential moving average)
 PER_PAGE          = 8     # files per page in the browser
+ROW_Y0            = 90    # text baseline of the first browser row
+ROW_GAP           = 55    # vertical distance between browser rows
+# MediaPipe runs on every Nth frame while a hand is tracked; holds are 0.35 s
+# and up, and the smoothed cursor hides the reuse in between
+INFER_EVERY       = 2
 
 # Colours (BGR)
 C_WHITE   = (255, 255, 255)
@@ -104,13 +96,6 @@ def find_videos():
     return sorted(results)
 
 
-def _hand_size(lm, w, h):
-    """Wrist-to-MCP reference distance, clamped to ≥ 20 px."""
-    ref   = np.array([lm[9].x * w,  lm[9].y  * h])
-    wrist = np.array([lm[0].x * w,  lm[0].y  * h])
-    return max(20.0, float(np.linalg.norm(ref - wrist)))
-
-
 # ---------------------------------------------------------------------------
 # Main class
 # ---------------------------------------------------------------------------
@@ -119,19 +104,27 @@ class VideoPlayer:
     """Gesture-driven video browser with external-player launch."""
 
     def __init__(self):
-        self.videos = find_videos()
+        # The folder walk runs on a background thread so the camera and the
+        # detector start without waiting for it; the list shows up complete
+        # in one assignment, and is empty until then
+        self.videos: list[str] = []
+        self._video_items: list[tuple[str, str]] = []   # (path, row label)
+        threading.Thread(target=self._load_videos, daemon=True).start()
         self.page   = 0
 
-        # MediaPipe
-        self.mp_hands = mp.solutions.hands
-        self.hands    = self.mp_hands.Hands(max_num_hands=1,
-                                            min_detection_confidence=0.65,
-                                            min_tracking_confidence=0.65)
-        self.mp_draw  = mp.solutions.drawing_utils
-
-        # Camera
-        self.cap = cv2.VideoCapture(0)
+        # MediaPipe: lite model in tracking mode, so the palm detector only
+        # reruns when tracking is lost.  Detection confidence is lower than
+        # tracking so a hand is picked up sooner; the hold timers debounce
+        # the occasional false detection
+        self.hands = mp.solutions.hands.Hands(static_image_mode=False,
+                                              max_num_hands=1,
+                                              model_complexity=0,  # lite model
+                                              min_detection_confidence=0.5,
+                                              min_tracking_confidence=0.65)
 
+        # Camera; the capture/inference pipeline is started by run()
+        self.cap = open_camera()
+        self.pipeline = None
 
         # Gesture timers  (None = not currently timing)
         self.pinch_start:        float | None = None
@@ -147,68 +140,84 @@ class VideoPlayer:
         # Playback state tracking (for on-screen display only)
         self.is_paused:   bool         = False
         self.last_opened: str | None   = None   # basename of last opened file
+        # Window close running on a worker thread, and its (name, closed)
+        # outcome once it has finished
+        self._closing:      bool                     = False
+        self._close_result: tuple[str, bool] | None = None
 
-        # Cursor smoothing  (np.ndarray | None)
+        # Cursor smoothing  ((x, y) | None)
         self.cursor_smooth = None
 
+        # Browser header, rows and hints, rendered once per page layout
+        self._browser_bg  = None
+        self._browser_key = None
+
+    def _load_videos(self):
+        """Scan VIDEO_FOLDER and build the browser's row labels once."""
+        videos = find_videos()
+        items = []
+        for path in videos:
+            name = os.path.basename(path)
+            items.append((path, name if len(name) < 52 else name[:49] + '...'))
+        self._video_items = items
+        self.videos = videos
+        if not videos:
+            print(f'[VideoPlayer] No videos found in {VIDEO_FOLDER}')
+
     # ------------------------------------------------------------------
     # Gesture detectors
     # ------------------------------------------------------------------
 
-    def _detect_pinch(self, lm, w, h):
-        """Returns (is_pinched, cursor_point)."""
-        tx, ty = lm[4].x * w, lm[4].y * h
-        ix, iy = lm[8].x * w, lm[8].y * h
-        dist   = np.hypot(tx - ix, ty - iy)
-        hs     = _hand_size(lm, w, h)
-        return dist < hs * 0.28, (int(ix), int(iy))
-
-    def _detect_fist(self, lm, w, h):
-        wrist = np.array([lm[0].x * w, lm[0].y * h])
-        tips  = [8, 12, 16, 20]
-        avg   = np.mean([np.linalg.norm(np.array([lm[i].x * w, lm[i].y * h]) - wrist)
-                         for i in tips])
-        return avg < _hand_size(lm, w, h) * 0.72
-
-    def _detect_back_gesture(self, lm):
+    # `pts` is the hand's (21, 2) normalized landmark array, copied out of
+    # the MediaPipe result once per frame by landmarks_to_array
+
+    def _detect_pinch_fist(self, pts, w, h):
+        """Returns (is_pinched, is_fist) from one kernel call."""
+        _, fist, pinch, _, _ = hand_features(pts, w, h, 0.72, 0.28)
+        return pinch, fist
+
+    def _detect_back_gesture(self, pts):
         """index + middle up, ring + pinky down."""
-        try:
-            return (lm[8].y  < lm[6].y  and
-                    lm[12].y < lm[10].y and
-                    lm[16].y > lm[14].y and
-                    lm[20].y > lm[18].y)
-        except Exception:
-            return False
+        return (fold_finger_code(pts, 0.0) & 0b01111) == 0b01100
 
-    def _detect_open_palm(self, lm):
+    def _detect_open_palm(self, pts):
         """All four fingers AND thumb clearly extended."""
-        try:
-            thumb_ext  = abs(lm[4].x - lm[2].x) > 0.04
-            index_ext  = lm[8].y  < lm[6].y  - 0.02
-            middle_ext = lm[12].y < lm[10].y - 0.02
-            ring_ext   = lm[16].y < lm[14].y - 0.02
-            pinky_ext  = lm[20].y < lm[18].y - 0.02
-            return thumb_ext and index_ext and middle_ext and ring_ext and pinky_ext
-        except Exception:
-            return False
+        return span_finger_code(pts, 0.04, 0.02) == 0b11111
 
-    def _detect_master_exit(self, lm):
+    def _detect_master_exit(self, pts):
         """Thumb + index + pinky up; middle + ring down."""
-        try:
-            thumb_up  = lm[4].x < lm[3].x
-            idx_up    = lm[8].y  < lm[6].y  - 0.02
-            mid_up    = lm[12].y < lm[10].y - 0.02
-            ring_up   = lm[16].y < lm[14].y - 0.02
-            pinky_up  = lm[20].y < lm[18].y - 0.02
-            return thumb_up and idx_up and pinky_up and (not mid_up) and (not ring_up)
-        except Exception:
-            return False
+        return fold_finger_code(pts, 0.02) == 0b11001
 
     def _close_video(self):
-        """Attempt to close the externally opened video player window."""
-        if not self.last_opened:
+        """Start closing the externally opened video player window.
+
+        Walking every top-level window takes tens to hundreds of ms, so the
+        attempts run on a worker thread instead of freezing the preview
+        right as the fist lands; `_finish_close` applies the outcome.
+        """
+        if not self.last_opened or self._closing:
             return False
-        title_sub = self.last_opened.lower()
+        self._closing = True
+        name = self.last_opened
+
+        def worker():
+            self._close_result = (name, self._close_window(name.lower()))
+
+        threading.Thread(target=worker, daemon=True).start()
+        return True
+
+    def _finish_close(self):
+        """Apply a finished close attempt's outcome on the main thread."""
+        name, closed = self._close_result
+        self._close_result = None
+        self._closing = False
+        if closed and self.last_opened == name:
+            print(f'[VideoPlayer] Closed: {name}')
+            self.last_opened = None
+            self.is_paused   = False
+
+    def _close_window(self, title_sub):
+        """Try each close method in turn; runs on the close worker thread."""
         closed = False
 
         # Method 1: pygetwindow
@@ -232,29 +241,32 @@ class VideoPlayer:
             try:
                 if win32gui and win32con:
                     found = []
+                    needle_len = len(title_sub)
                     def _cb(hwnd, extra):
                         txt = win32gui.GetWindowText(hwnd)
-                        if txt and title_sub in txt.lower():
+                        # Titles shorter than the file name cannot contain
+                        # it, so only the others are lowercased and searched
+                        if len(txt) >= needle_len and title_sub in txt.lower():
                             win32gui.PostMessage(hwnd, win32con.WM_CLOSE, 0, 0)
                             extra.append(hwnd)
-                    win32gui.EnumWindows(_cb, found)
-                    if found:
-                        closed = True
+                            return False  # stop at the player's window
+                        return True
+                    try:
+                        win32gui.EnumWindows(_cb, found)
+                    except Exception:
+                        pass  # pywin32 raises when the callback ends enumeration early
+                    closed = bool(found)
             except Exception:
                 pass
 
         # Method 3: Alt+F4 fallback
         if not closed:
             try:
-                pyautogui.hotkey('alt', 'f4')
+                hotkey('alt', 'f4')
                 closed = True
             except Exception:
                 pass
 
-        if closed:
-            print(f'[VideoPlayer] Closed: {self.last_opened}')
-            self.last_opened = None
-            self.is_paused   = False
         return closed
 
     # ------------------------------------------------------------------
@@ -265,68 +277,74 @@ class VideoPlayer:
         if not cursor:
             return None
         cx, cy = cursor
-        for i in range(n):
-            y = y0 + i * gap
-            if 40 < cx < 760 and y - 28 < cy < y + 10:
-                return i
+        if not 40 < cx < 760:
+            return None
+        # Rows are evenly spaced, so the candidate row is one division;
+        # the hit band is y - 28 < cy < y + 10 around each row's baseline y
+        row, off = divmod(cy - (y0 - 28), gap)
+        if 0 <= row < n and 0 < off < 38:
+            return int(row)
         return None
 
     # ------------------------------------------------------------------
     # Drawing
     # ------------------------------------------------------------------
 
-    def _draw_browser(self, frame, cursor, pinch, pinch_elapsed):
+    def _draw_browser(self, frame, cursor, pinch, pinch_elapsed, now):
         h, w, _ = frame.shape
+        items = self._video_items
 
-        # Dark header
-        cv2.rectangle(frame, (0, 0), (w, 55), C_HEADER, -1)
-        cv2.putText(frame, 'VIDEO PLAYER', (16, 36),
-                    cv2.FONT_HERSHEY_SIMPLEX, 1.1, C_WHITE, 2)
-        page_total = max(1, (len(self.videos) + PER_PAGE - 1) // PER_PAGE)
-        cv2.putText(frame, f'Page {self.page + 1}/{page_total}', (w - 160, 36),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.65, C_CYAN, 1)
-
-        # File list
-        y0  = 90
-        gap = 55
+        # Header, row boxes, labels and hints only change with the page or
+        # the video list, so they are painted once per layout
         start = self.page * PER_PAGE
-        hovered_row = self._row_hit(cursor, y0, gap, PER_PAGE)
-
-        for i in range(PER_PAGE):
-            idx = start + i
-            y   = y0 + i * gap
-            if idx >= len(self.videos):
-                break
-
-            name  = os.path.basename(self.videos[idx])
-            short = name if len(name) < 52 else name[:49] + '...'
-
-            is_hover = (hovered_row == i)
-            box_col  = C_ROW_HL if is_hover else (20, 20, 40)
-            txt_col  = C_GREEN  if is_hover else C_WHITE
-            border_t = 2        if is_hover else 1
-
-            cv2.rectangle(frame, (38, y - 28), (762, y + 12), box_col,  -1)
-            cv2.rectangle(frame, (38, y - 28), (762, y + 12), C_WHITE, border_t)
-            cv2.putText(frame, short, (52, y), cv2.FONT_HERSHEY_SIMPLEX, 0.62, txt_col, 1)
+        count = max(0, min(PER_PAGE, len(items) - start))
+        key = (frame.shape, self.page, len(items))
+        if self._browser_bg is None or key != self._browser_key:
+            page_total = max(1, (len(items) + PER_PAGE - 1) // PER_PAGE)
+
+            def paint(bg):
+                # Dark header
+                cv2.rectangle(bg, (0, 0), (w, 55), C_HEADER, -1)
+                cv2.putText(bg, 'VIDEO PLAYER', (16, 36),
+                            cv2.FONT_HERSHEY_SIMPLEX, 1.1, C_WHITE, 2)
+                cv2.putText(bg, f'Page {self.page + 1}/{page_total}', (w - 160, 36),
+                            cv2.FONT_HERSHEY_SIMPLEX, 0.65, C_CYAN, 1)
+                # File list
+                for i in range(count):
+                    y = ROW_Y0 + i * ROW_GAP
+                    cv2.rectangle(bg, (38, y - 28), (762, y + 12), (20, 20, 40), -1)
+                    cv2.rectangle(bg, (38, y - 28), (762, y + 12), C_WHITE, 1)
+                    cv2.putText(bg, items[start + i][1], (52, y),
+                                cv2.FONT_HERSHEY_SIMPLEX, 0.62, C_WHITE, 1)
+                # Bottom hints
+                cv2.putText(bg, 'PINCH=Open | FIST=Close | PEACE=Prev Page | ALL FINGERS (2s)=Play/Pause | T+I+Pinky(2s)=Exit',
+                            (12, h - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.40, (180, 180, 180), 1)
+
+            self._browser_bg = StaticOverlay(h, w, paint)
+            self._browser_key = key
+        self._browser_bg.apply(frame)
+
+        # Hovered row, repainted over its cached box
+        hovered_row = self._row_hit(cursor, ROW_Y0, ROW_GAP, PER_PAGE)
+        if hovered_row is not None and hovered_row < count:
+            y = ROW_Y0 + hovered_row * ROW_GAP
+            cv2.rectangle(frame, (38, y - 28), (762, y + 12), C_ROW_HL, -1)
+            cv2.rectangle(frame, (38, y - 28), (762, y + 12), C_WHITE, 2)
+            cv2.putText(frame, items[start + hovered_row][1], (52, y),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.62, C_GREEN, 1)
 
             # pinch progress arc on hovered row
-            if is_hover and pinch and pinch_elapsed > 0 and cursor:
+            if pinch and pinch_elapsed > 0 and cursor:
                 pct = min(1.0, pinch_elapsed / PINCH_HOLD)
                 cv2.ellipse(frame, cursor, (22, 22), 0, 0, int(360 * pct), C_GREEN, 2)
 
-        # Bottom hints
-        hint_y = h - 10
-        cv2.putText(frame, 'PINCH=Open | FIST=Close | PEACE=Prev Page | ALL FINGERS (2s)=Play/Pause | T+I+Pinky(2s)=Exit',
-                    (12, hint_y), cv2.FONT_HERSHEY_SIMPLEX, 0.40, (180, 180, 180), 1)
-
         # Cursor dot
         if cursor:
             cv2.circle(frame, cursor, 8, C_WHITE, -1)
 
         # Fist hold progress bar (red)
         if self._fist_holding:
-            elapsed = time.time() - self.fist_start if self.fist_start else 0
+            elapsed = now - self.fist_start if self.fist_start else 0
             pct     = min(1.0, elapsed / FIST_HOLD)
             bar_w   = int(pct * (w - 40))
             cv2.rectangle(frame, (20, h - 58), (20 + bar_w, h - 44), (60, 60, 220), -1)
@@ -336,7 +354,7 @@ class VideoPlayer:
 
         # Palm hold progress bar (green)
         if self._palm_holding:
-            elapsed   = time.time() - self.palm_start if self.palm_start else 0
+            elapsed   = now - self.palm_start if self.palm_start else 0
             pct       = min(1.0, elapsed / PALM_HOLD)
             bar_w     = int(pct * (w - 40))
             lbl       = 'PAUSING...' if not self.is_paused else 'RESUMING...'
@@ -366,52 +384,60 @@ class VideoPlayer:
         print('  ESC                     → quit')
         print('========================================\n')
 
-        if not self.videos:
-            print(f'[VideoPlayer] No videos found in {VIDEO_FOLDER}')
-
+        # Capture and MediaPipe run on the pipeline threads (camera reads,
+        # mirroring and inference overlap); this thread only runs the
+        # gesture logic, drawing and imshow
+        warm_up()
+        self.pipeline = HandPipeline(self.cap, self.hands, infer_every=INFER_EVERY).start()
+        res = None
         while True:
-            ret, frame = self.cap.read()
-            if not ret:
+            item = self.pipeline.read()
+            if item is None:
                 break
 
-            frame = cv2.flip(frame, 1)
+            # `now` is the frame's capture stamp (time.monotonic()): one
+            # clock for every hold timer this frame, immune to clock changes
+            frame, new_res, now = item
             h, w, _ = frame.shape
-            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            res = self.hands.process(rgb)
+            # Frames the pipeline did not infer (off-cadence) reuse the last
+            # result; before the first one there is no hand
+            if new_res is not None:
+                res = new_res
+            if self._close_result is not None:
+                self._finish_close()
 
             cursor       = None
             pinch        = False
-            pinch_pt     = None
             pinch_elapsed = 0.0
             back_g       = False
             open_palm    = False
 
-            if res.multi_hand_landmarks:
-                lm = res.multi_hand_landmarks[0].landmark
-                self.mp_draw.draw_landmarks(frame,
-                                            res.multi_hand_landmarks[0],
-                                            self.mp_hands.HAND_CONNECTIONS)
+            if res is not None and res.multi_hand_landmarks:
+                lm  = res.multi_hand_landmarks[0].landmark
+                pts = landmarks_to_array(lm)
+                draw_hand(frame, lm)
 
                 # Smooth cursor (index fingertip)
-                raw_pt = np.array([lm[8].x * w, lm[8].y * h])
+                # (two scalar EMAs: no per-frame array for a 2-vector)
+                raw_x, raw_y = pts[8, 0] * w, pts[8, 1] * h
                 if self.cursor_smooth is None:
-                    self.cursor_smooth = raw_pt.copy()
+                    self.cursor_smooth = (raw_x, raw_y)
                 else:
-                    self.cursor_smooth = ((1 - CURSOR_ALPHA) * self.cursor_smooth
-                                          + CURSOR_ALPHA * raw_pt)
+                    sx, sy = self.cursor_smooth
+                    self.cursor_smooth = (sx + CURSOR_ALPHA * (raw_x - sx),
+                                          sy + CURSOR_ALPHA * (raw_y - sy))
                 cursor = (int(self.cursor_smooth[0]), int(self.cursor_smooth[1]))
 
-                pinch, pinch_pt = self._detect_pinch(lm, w, h)
-                back_g          = self._detect_back_gesture(lm)
-                open_palm       = self._detect_open_palm(lm)
+                pinch, fist     = self._detect_pinch_fist(pts, w, h)
+                back_g          = self._detect_back_gesture(pts)
+                open_palm       = self._detect_open_palm(pts)
 
                 # ── Fist → close video ──────────────────────────────
-                fist = self._detect_fist(lm, w, h)
                 self._fist_holding = fist and (self.last_opened is not None)
                 if fist and self.last_opened:
                     if self.fist_start is None:
-                        self.fist_start = time.time()
-                    fist_elapsed = time.time() - self.fist_start
+                        self.fist_start = now
+                    fist_elapsed = now - self.fist_start
                     if fist_elapsed >= FIST_HOLD:
                         self._close_video()
                         self.fist_start = None
@@ -419,10 +445,10 @@ class VideoPlayer:
                     self.fist_start = None
 
                 # ── Master-exit gesture ──────────────────────────────
-                if self._detect_master_exit(lm):
+                if self._detect_master_exit(pts):
                     if self.master_exit_start is None:
-                        self.master_exit_start = time.time()
-                    elif time.time() - self.master_exit_start >= MASTER_EXIT_HOLD:
+                        self.master_exit_start = now
+                    elif now - self.master_exit_start >= MASTER_EXIT_HOLD:
                         print('[VideoPlayer] Master-exit gesture → returning to controller')
                         self._cleanup()
                         return
@@ -433,13 +459,13 @@ class VideoPlayer:
                 self._palm_holding = open_palm
                 if open_palm:
                     if self.palm_start is None:
-                        self.palm_start = time.time()
-                    palm_elapsed = time.time() - self.palm_start
+                        self.palm_start = now
+                    palm_elapsed = now - self.palm_start
                     if (palm_elapsed >= PALM_HOLD and
-                            time.time() - self.last_palm_action >= PALM_COOLDOWN):
-                        _send_play_pause()
+                            now - self.last_palm_action >= PALM_COOLDOWN):
+                        press_key('playpause')
                         self.is_paused      = not self.is_paused
-                        self.last_palm_action = time.time()
+                        self.last_palm_action = now
                         self.palm_start       = None
                         print('[VideoPlayer] Play/Pause toggled →',
                               'PAUSED' if self.is_paused else 'PLAYING')
@@ -449,8 +475,8 @@ class VideoPlayer:
                 # ── Back gesture → previous page ────────────────────
                 if back_g and not pinch:
                     if self.back_start is None:
-                        self.back_start = time.time()
-                    back_elapsed = time.time() - self.back_start
+                        self.back_start = now
+                    back_elapsed = now - self.back_start
                     if back_elapsed >= BACK_HOLD:
                         if self.page > 0:
                             self.page -= 1
@@ -460,16 +486,17 @@ class VideoPlayer:
                     self.back_start = None
 
                 # ── Pinch → open video ───────────────────────────────
-                hovered_row = self._row_hit(cursor, 90, 55, PER_PAGE)
+                hovered_row = self._row_hit(cursor, ROW_Y0, ROW_GAP, PER_PAGE)
                 if pinch and hovered_row is not None:
                     if self.pinch_start is None:
-                        self.pinch_start = time.time()
-                    pinch_elapsed = time.time() - self.pinch_start
+                        self.pinch_start = now
+                    pinch_elapsed = now - self.pinch_start
 
                     if pinch_elapsed >= PINCH_HOLD and not self.pinched:
+                        items    = self._video_items
                         file_idx = self.page * PER_PAGE + hovered_row
-                        if 0 <= file_idx < len(self.videos):
-                            path = self.videos[file_idx]
+                        if 0 <= file_idx < len(items):
+                            path = items[file_idx][0]
                             try:
                                 os.startfile(path)
                                 self.last_opened = os.path.basename(path)
@@ -478,8 +505,8 @@ class VideoPlayer:
                             except Exception as e:
                                 print(f'[VideoPlayer] Open error: {e}')
                         # Next page if no more rows visible
-                        elif file_idx >= len(self.videos):
-                            page_total = max(1, (len(self.videos) + PER_PAGE - 1) // PER_PAGE)
+                        elif file_idx >= len(items):
+                            page_total = max(1, (len(items) + PER_PAGE - 1) // PER_PAGE)
                             if self.page + 1 < page_total:
                                 self.page += 1
                         self.pinched    = True
@@ -504,17 +531,21 @@ class VideoPlayer:
                 self._fist_holding     = False
 
             # ── Draw UI ─────────────────────────────────────────────
-            self._draw_browser(frame, cursor, pinch, pinch_elapsed)
+            self._draw_browser(frame, cursor, pinch, pinch_elapsed, now)
 
-            cv2.imshow('Video Player', frame)
-            key = cv2.waitKey(1) & 0xFF
-            if key == 27:   # ESC
+            # pollKey instead of waitKey's 1 ms sleep; skipped when headless
+            if show_frame('Video Player', frame, 27):   # ESC
                 break
 
         self._cleanup()
 
     def _cleanup(self):
+        # The pipeline must stop before the camera goes away under it
+        if self.pipeline is not None:
+            self.pipeline.stop()
+            self.pipeline = None
         self.cap.release()
+        self.hands.close()
         cv2.destroyAllWindows()
 
 
@@ -17,6 +17,8 @@ from ctypes import cast, POINTER
 from comtypes import CLSCTX_ALL
 from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
 
+from frame_pipeline import open_camera
+
 print("Starting Volume Gesture Control...")
 
 # ── Audio setup ──────────────────────────────────────────────────────────────
@@ -57,9 +59,10 @@ def run_volume_control():
 
     hands = mpHands.Hands(max_num_hands=1,
                           min_detection_confidence=0.7,
-                          min_tracking_confidence=0.7)
+                          min_tracking_confidence=0.7,
+                          model_complexity=0)  # lite model
 
-    cap = cv2.VideoCapture(0)
+    cap = open_camera()
     if not cap.isOpened():
         print("Camera not detected!")
         return
@@ -2,11 +2,13 @@
 #Docstring for volume
 import cv2
 import mediapipe as mp
-import numpy as np
 from ctypes import cast, POINTER
 from comtypes import CLSCTX_ALL
 from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
 import math
+import time
+
+from frame_pipeline import open_camera
 
 # -----------------------------
 # Initialize Windows Volume Control
@@ -19,38 +21,59 @@ volRange = volume.GetVolumeRange()
 minVol = volRange[0]
 maxVol = volRange[1]
 
+# Pinch length 30..200 px maps linearly onto the device range and onto
+# 0..100 %: a precomputed slope/offset and one clamp per frame
+VOL_K = (maxVol - minVol) / 170.0
+VOL_B = minVol - 30 * VOL_K
+PCT_K = 100.0 / 170.0
+
+# Each SetMasterVolumeLevel is a COM call into Core Audio: skip changes
+# smaller than VOL_EPS dB and send at most VOL_MAX_HZ updates per second
+VOL_EPS = 0.25
+VOL_MAX_HZ = 30
+last_vol_sent = None
+last_vol_time = 0.0
+
 # -----------------------------
 # Mediapipe Setup
 # -----------------------------
 mpHands = mp.solutions.hands
-hands = mpHands.Hands(max_num_hands=1)
+# Lite model in tracking mode: the palm detector only reruns when tracking
+# is lost.  The lower detection confidence picks the hand up sooner
+hands = mpHands.Hands(static_image_mode=False, max_num_hands=1,
+                      model_complexity=0, min_detection_confidence=0.5)
 mpDraw = mp.solutions.drawing_utils
 
-cap = cv2.VideoCapture(0)
+cap = open_camera()
+
+# The mirror and the RGB copy are written into these every frame instead of
+# allocating two new frames per iteration (OpenCV allocates them on the
+# first call, or again should the frame size change)
+flip_buf = None
+rgb_buf = None
 
 while True:
     success, img = cap.read()
     if not success:
         break
 
-    img = cv2.flip(img, 1)
-    rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-    results = hands.process(rgb)
+    img = flip_buf = cv2.flip(img, 1, dst=flip_buf)
+    if rgb_buf is not None:
+        rgb_buf.flags.writeable = True
+    rgb_buf = cv2.cvtColor(img, cv2.COLOR_BGR2RGB, dst=rgb_buf)
+    # Read-only lets MediaPipe pass the buffer by reference
+    rgb_buf.flags.writeable = False
+    results = hands.process(rgb_buf)
 
     if results.multi_hand_landmarks:
         for handLms in results.multi_hand_landmarks:
-            lmList = []
-            for id, lm in enumerate(handLms.landmark):
-                h, w, c = img.shape
-                cx, cy = int(lm.x * w), int(lm.y * h)
-                lmList.append((id, cx, cy))
-
             mpDraw.draw_landmarks(img, handLms, mpHands.HAND_CONNECTIONS)
 
-            # Thumb tip = id 4
-            # Index tip = id 8
-            x1, y1 = lmList[4][1], lmList[4][2]
-            x2, y2 = lmList[8][1], lmList[8][2]
+            # Only the thumb tip (id 4) and index tip (id 8) are used
+            h, w = img.shape[:2]
+            thumb, index = handLms.landmark[4], handLms.landmark[8]
+            x1, y1 = int(thumb.x * w), int(thumb.y * h)
+            x2, y2 = int(index.x * w), int(index.y * h)
 
             # Draw circles
             cv2.circle(img, (x1, y1), 10, (255, 0, 0), cv2.FILLED)
@@ -61,11 +84,16 @@ while True:
             length = math.hypot(x2 - x1, y2 - y1)
 
             # Convert distance to volume range
-            vol = np.interp(length, [30, 200], [minVol, maxVol])
-            volume.SetMasterVolumeLevel(vol, None)
+            vol = max(minVol, min(maxVol, length * VOL_K + VOL_B))
+            now = time.monotonic()
+            if ((last_vol_sent is None or abs(vol - last_vol_sent) > VOL_EPS)
+                    and now - last_vol_time >= 1.0 / VOL_MAX_HZ):
+                volume.SetMasterVolumeLevel(vol, None)
+                last_vol_sent = vol
+                last_vol_time = now
 
             # Volume percentage display
-            volPercent = np.interp(length, [30, 200], [0, 100])
+            volPercent = max(0.0, min(100.0, (length - 30) * PCT_K))
 
             cv2.putText(img, f'Volume: {int(volPercent)} %',
                         (40, 50), cv2.FONT_HERSHEY_SIMPLEX,
@@ -183,7 +211,7 @@ while True:
 
             # Always show actual system volume
             currentVol = volume.GetMasterVolumeLevel()
-            volPercent = np.interp(currentVol, [minVol, maxVol], [0, 100])
+            volPercent = (currentVol - minVol) * 100.0 / (maxVol - minVol)
 
             cv2.putText(img, f'Volume: {int(volPercent)} %',
                         (40, 50),